@@ -21,4 +21,16 @@ class GANModel():
         output = np.round((output + 1) * 7.5)
         output = output.reshape((64, 64))
 
-        return Maze.build_from_array(output, 64, 64)
\ No newline at end of file
+        return Maze.build_from_array(output, 64, 64)
+
+    def generate_many(self, count: int) -> list:
+        '''
+        Generates @count mazes with a single prediction and decodes all of them in one call.
+        '''
+        _input = np.random.random(size=(count, 100))
+        output = self.generator.predict(_input, verbose=0)
+
+        output = np.round((output + 1) * 7.5)
+        output = output.reshape((count, 64 * 64))
+
+        return Maze.build_from_arrays(output, 64, 64)
\ No newline at end of file
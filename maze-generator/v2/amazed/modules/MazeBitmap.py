@@ -14,5 +14,6 @@ def maze_bitmap(bitmap_path:str, x:int, y:int) -> Maze:
         for j in range(maze.columns):
             if a[i][j] == 0:
                 maze.data[i][j].active = False
+    maze.invalidate()
     DepthFirstSearch(maze, gif=False, x=x, y=y)
     return maze
\ No newline at end of file
@@ -0,0 +1,152 @@
+import numpy as np
+from PIL import Image
+
+from amazed.modules.maze import Maze, ArrayMaze, encode, decode, wall_bits, unpack_wall_bits, carve_wall_bits, render, neighbor_table
+from amazed.modules.solver import bfs_distances
+from amazed.modules.components import Components, count_areas
+
+
+class MazeBatch:
+    '''
+    Holds @count mazes of the same shape as one contiguous (count, rows, columns) uint8 wall array
+    and one (count, rows, columns) boolean active array.\n
+    Indexing a batch returns ArrayMaze views over its storage (no copy), so any Sculptor or MazeSolver can work on them.
+    '''
+
+    def __init__(self, count: int, rows: int, columns: int, walls: np.ndarray = None, active: np.ndarray = None):
+        '''
+        Constructs @count mazes with all walls present.\n
+        @walls, @active: optional (count, rows, columns) arrays to use as storage instead of new ones (they are not copied).
+        '''
+        self.count = count
+        self.rows = rows
+        self.columns = columns
+
+        self.walls = np.full((count, rows, columns), Maze.ALL_WALLS, dtype=np.uint8) if walls is None else walls
+        self.active = np.ones((count, rows, columns), dtype=bool) if active is None else active
+        if self.walls.shape != (count, rows, columns) or self.walls.dtype != np.uint8:
+            raise ValueError(f'Expected a uint8 wall array of shape {(count, rows, columns)}, got {self.walls.dtype} {self.walls.shape}.')
+        if self.active.shape != (count, rows, columns) or self.active.dtype != bool:
+            raise ValueError(f'Expected a boolean active array of shape {(count, rows, columns)}, got {self.active.dtype} {self.active.shape}.')
+
+    @classmethod
+    def from_mazes(cls, mazes: list):
+        '''
+        Copies a list of mazes (of the same shape) into a new batch.
+        '''
+        if len(mazes) == 0:
+            raise ValueError('Cannot create a batch from an empty list of mazes.')
+        walls = np.stack([maze.get_wall_mask() for maze in mazes])
+        active = np.stack([maze.get_active_mask() for maze in mazes])
+        return cls(len(mazes), mazes[0].rows, mazes[0].columns, walls, active)
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray, rows: int, columns: int):
+        '''
+        Decodes a (N, rows * columns) array encoded with Maze.array() (e.g. a dataset or GAN outputs), see decode().
+        '''
+        walls = decode(arr, rows, columns)
+        return cls(len(walls), rows, columns, walls)
+
+    @classmethod
+    def load(cls, file: str):
+        '''
+        Loads a batch saved with save() (or a single maze saved with Maze.save()), without parsing: see Maze.load().
+        '''
+        from amazed.modules import mazefile
+        (header, walls, active) = mazefile.load(file)
+        return cls(header["count"], header["rows"], header["columns"], walls, active)
+
+    def save(self, file: str, seed=None, algorithm: str = None):
+        '''
+        Saves all mazes into a single file, see Maze.save().
+        '''
+        from amazed.modules import mazefile
+        mazefile.save(self, file, seed, algorithm)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        '''
+        batch[i] is an ArrayMaze view of the i-th maze, batch[i:j] is a MazeBatch view. Neither copies the walls.
+        '''
+        if isinstance(index, slice):
+            walls = self.walls[index]
+            return MazeBatch(len(walls), self.rows, self.columns, walls, self.active[index])
+        return ArrayMaze(self.rows, self.columns, walls=self.walls[index], active=self.active[index])
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def reset(self):
+        self.walls.fill(Maze.ALL_WALLS)
+        self.active.fill(True)
+
+    def array(self) -> np.ndarray:
+        '''
+        Encodes all mazes, same as Maze.array(). Returns a float array of shape (count, rows * columns).
+        '''
+        return encode(self.walls).astype(np.float64)
+
+    def get_wall_bits(self, packed: bool = False) -> np.ndarray:
+        '''
+        Internal walls of all mazes, as a (count, length) boolean array (True marks a wall).\n
+        Same layout as Maze.get_wall_bitstring().\n
+        @packed: if set to True, the bits are packed 8 per byte into a (count, ceil(length / 8)) uint8 array.
+        '''
+        bits = wall_bits(self.walls)
+        return np.packbits(bits, axis=-1) if packed else bits
+
+    def set_wall_bits(self, bits: np.ndarray):
+        '''
+        Carves every internal wall whose bit is False, in all mazes. @bits is the result of get_wall_bits() (either packed or not).\n
+        The mazes need to be reseted first.
+        '''
+        carve_wall_bits(self.walls, unpack_wall_bits(bits, self.rows, self.columns))
+
+    def set_wall_bitstring(self, idv: list):
+        '''
+        Same as set_wall_bits(), but for a list of bitstrings (see Maze.set_wall_bitstring()).
+        '''
+        self.set_wall_bits(np.array([[_ for _ in bitstring] for bitstring in idv]) != "0")
+
+    def count_areas(self) -> np.ndarray:
+        '''
+        Number of separate areas in each maze (see flood_fill()), as an int array of shape (count,).
+        '''
+        return count_areas(self.walls, self.active)
+
+    def components(self) -> Components:
+        '''
+        Labels, number and sizes of the areas of every maze, see Components.
+        '''
+        return Components(self.walls, self.active)
+
+    def distance_fields(self, start: tuple = (0, 0)) -> np.ndarray:
+        '''
+        Distance from @start to every cell, in all mazes at once (one search over the whole batch, see distance_field()).\n
+        Returns an int array of shape (count, rows, columns), with -1 for the cells that cannot be reached.
+        E.g. distance_fields()[:, -1, -1] != -1 tells which mazes can be solved.
+        '''
+        size = self.rows * self.columns
+        sources = np.arange(self.count) * size + start[0] * self.columns + start[1]
+        return bfs_distances(neighbor_table(self.walls, self.active), sources).reshape(self.walls.shape)
+
+    def render(self, distance: int = 10, cell_colors: np.ndarray = None, checkers: bool = True) -> np.ndarray:
+        '''
+        Renders all mazes at once. Returns a uint8 array of shape (count, rows * distance + 1, columns * distance + 1, 3).
+        '''
+        return render(self.walls, self.active, distance, cell_colors, checkers)
+
+    def export(self, distance: int = 10, output: str = None) -> list:
+        '''
+        Exports all mazes to images, see Maze.export().\n
+        @output: optional path containing a "{index}" field, e.g. "tmp/maze_{index}.png".
+        '''
+        images = [Image.fromarray(pixels) for pixels in self.render(distance)]
+        if output is not None:
+            for index, img in enumerate(images):
+                img.save(output.format(index=index))
+        return images
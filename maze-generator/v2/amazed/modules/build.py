@@ -3,36 +3,75 @@ import threading
 import time
 import numpy as np
 
-from amazed.modules.maze import Maze
-from amazed.modules.solver import flood_fill
+from amazed.modules.maze import Maze, ArrayMaze, neighbor_table, unpack_wall_bits
+from amazed.modules.batch import MazeBatch
+from amazed.modules.components import DisjointSet
 
 class Sculptor():
     '''
     Default class for all maze generation classes.\n
     Carves a maze in-place.
     '''
+
+    # Maximum number of walls queued by carve() before they are carved
+    FLUSH_SIZE = 1 << 16
+
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
         self.maze = maze
         self.frames = []
         self.seed = random.random() if seed is None else seed
         random.seed(self.seed)
 
-        self.cell_colors = {}
+        # Created by the first add_frame(), it is as large as the maze
+        self.cell_colors = None
+        self._rng = None
+        self._edges = []
 
         if gif:
             self.progress_thread = threading.Thread(target=self.__progress__)
             self.progress_thread.daemon = True
             self.progress_thread.start()
 
+    @property
+    def rng(self) -> np.random.Generator:
+        '''
+        NumPy generator for vectorized sculptors, seeded from the (already seeded) random module on first use.
+        '''
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        return self._rng
+
+    def carve(self, x1, y1, x2, y2):
+        '''
+        Queues the removal of the wall between the adjacent cells (@x1, @y1) and (@x2, @y2).\n
+        Queued walls are carved in bulk by flush() (called by add_frame() and every FLUSH_SIZE walls), so a Sculptor using this
+        must call flush() when it is done and must not read the walls of the maze in between.
+        '''
+        self._edges.append((x1, y1, x2, y2))
+        if len(self._edges) >= Sculptor.FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        '''
+        Carves all queued walls (see carve()) with a single Maze.carve_pairs() call, which validates them in one pass.
+        '''
+        if len(self._edges) > 0:
+            self.maze.carve_pairs(*np.array(self._edges).T)
+            self._edges.clear()
+
     def add_frame(self, i, j):
+        self.flush()
+        if self.cell_colors is None:
+            self.cell_colors = self.maze.color_overlay()
+
         # Show the current cell as red
-        self.cell_colors[f"{i}, {j}"] = self.maze.CURRENT_CELL_COLOR
+        self.cell_colors[i, j] = self.maze.CURRENT_CELL_COLOR
 
         # Here you can modify the distance
         frame = self.maze.export(show=False, cell_colors=self.cell_colors)
         self.frames.append(frame)
         
-        self.cell_colors[f"{i}, {j}"] = self.maze.VISITED_CELL_COLOR
+        self.cell_colors[i, j] = self.maze.VISITED_CELL_COLOR
 
     def export(self, path: str = "maze_carving_process.gif", speed=50, looping=False):
         '''
@@ -73,116 +112,96 @@ class Sculptor():
 
 class BinaryTree(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        '''
+        Every cell carves to the NORTH or to the West, with a coin flip (to the other one if only one is possible).\n
+        All coins are flipped at once, the carved walls are found with array operations and written with Maze.set_wall_bits().
+        With @gif, the same walls are carved cell by cell instead, to get the frames.
+        '''
         super().__init__(maze, seed, gif)
 
-        if gif:
-            self.add_frame(0, 0)
-        
+        active = maze.get_active_mask()
+        north_ok = np.zeros_like(active)
+        north_ok[1:, :] = active[1:, :] & active[:-1, :]
+        west_ok = np.zeros_like(active)
+        west_ok[:, 1:] = active[:, 1:] & active[:, :-1]
+
+        # Carve North on heads, unless there is no cell there; Tails (or no cell to the North) carve West, if possible
+        heads = self.rng.random(active.shape, dtype=np.float32) < 0.5
+        north = north_ok & (heads | ~west_ok)
+        west = west_ok & ~north
+
+        if not gif:
+            # The North wall of a cell is the South wall of the one above, its West wall the East wall of the one on its left
+            maze.set_wall_bits(~np.concatenate((west[:, 1:].ravel(), north[1:, :].ravel())))
+            return
+
+        self.add_frame(0, 0)
         for i in range(maze.rows):
             for j in range(maze.columns):
-                # Carve North
-                if random.random() < 0.5:
-                    if maze.is_valid_position(i-1, j):
-                        maze.path(i, j, Maze.NORTH)
-                    # If the cell does not have a path to NORTH,
-                    # instead carve a path to West
-                    elif maze.is_valid_position(i, j-1):
-                        maze.path(i, j, Maze.WEST)
-                else:
-                    if maze.is_valid_position(i, j-1):
-                        maze.path(i, j, Maze.WEST)
-                    # If the cell does not have a path to West,
-                    # instead carve a path to NORTH
-                    elif maze.is_valid_position(i-1, j):
-                        maze.path(i, j, Maze.NORTH)
-    
-                if gif:
-                    self.add_frame(i, j)
+                if north[i, j]:
+                    self.carve(i, j, i-1, j)
+                elif west[i, j]:
+                    self.carve(i, j, i, j-1)
+                self.add_frame(i, j)
+
+        self.flush()
 
 class HuntAndKill(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False, x: int = 0, y: int = 0) -> None:
+        '''
+        Random walk through unvisited cells (kill) until stuck, then hunt: the first unvisited cell, row by row, is connected
+        to one of its visited neighbors and the walk goes on from there.\n
+        The hunt only moves forward, as the cells before it stay visited: visited is a bytearray of the cell ids (x * columns + y)
+        and bytearray.find() jumps to the next unvisited cell. Inactive cells count as visited from the start.
+        '''
         super().__init__(maze, seed, gif)
 
-        visited = np.zeros((maze.rows, maze.columns))
-        
-        unvisited_row = 0
-        unvisited_column = 0
-        self.add_frame(x, y)
-        for iter in range(maze.rows * maze.columns + 1):
-            visited[x][y] = 1
+        columns = maze.columns
+        # Active neighbors of each cell, in the NORTH, EAST, SOUTH, WEST order
+        adjacent = neighbor_table(np.zeros((maze.rows, columns), dtype=np.uint8), maze.get_active_mask()).tolist()
+        adjacent = [[other for other in row if other != -1] for row in adjacent]
+        visited = bytearray((~maze.get_active_mask()).astype(np.uint8).tobytes())
 
-            possible_directions = []
-            if maze.is_valid_position(x-1, y) and visited[x-1][y] == 0:
-                possible_directions.append(Maze.NORTH)
-            if maze.is_valid_position(x, y+1) and visited[x][y+1] == 0:
-                possible_directions.append(Maze.EAST)
-            if maze.is_valid_position(x+1, y) and visited[x+1][y] == 0:
-                possible_directions.append(Maze.SOUTH)
-            if maze.is_valid_position(x, y-1) and visited[x][y-1] == 0:
-                possible_directions.append(Maze.WEST)
-            
-            # Perform grid search in order to update x, y
-            if len(possible_directions) == 0:
+        if gif:
+            self.add_frame(x, y)
+        cell = x * columns + y
+        hunted = 0
+        while True:
+            visited[cell] = 1
 
-                found_unvisited = False
-                while unvisited_row < maze.rows:
-                    while unvisited_column < maze.columns:
-                        # Make a wall in a random (valid) direction (of an already visited cell) from the first unvisited cell found
-                        if visited[unvisited_row][unvisited_column] == 0:
-                            possible_directions = []
-                            if maze.is_valid_position(unvisited_row-1, unvisited_column) and visited[unvisited_row-1][unvisited_column] == 1:
-                                possible_directions.append(Maze.NORTH)
-                            if maze.is_valid_position(unvisited_row, unvisited_column+1) and visited[unvisited_row][unvisited_column+1] == 1:
-                                possible_directions.append(Maze.EAST)
-                            if maze.is_valid_position(unvisited_row+1, unvisited_column) and visited[unvisited_row+1][unvisited_column] == 1:
-                                possible_directions.append(Maze.SOUTH)
-                            if maze.is_valid_position(unvisited_row, unvisited_column-1) and visited[unvisited_row][unvisited_column-1] == 1:
-                                possible_directions.append(Maze.WEST)
-                            
-                            random.shuffle(possible_directions)
-
-                            # Update the current position
-                            # if gif: 
-                            #     self.add_frame(x, y)
-                            x = unvisited_row
-                            y = unvisited_column
-
-                            maze.path(x, y, possible_directions[0])
-                            if gif:
-                                self.add_frame(x, y)
-
-                            found_unvisited = True
-                            break
-
-                        unvisited_column += 1
-
-                    if unvisited_column == maze.columns:
-                        unvisited_row += 1
-                        unvisited_column = 0
-
-                    if found_unvisited:
-                        break
-                        
-                    
-            else:
+            possible_directions = [other for other in adjacent[cell] if not visited[other]]
+            if len(possible_directions) != 0:
                 random.shuffle(possible_directions)
-                maze.path(x, y, possible_directions[0])
+                self.carve(*divmod(cell, columns), *divmod(possible_directions[0], columns))
 
                 if gif:
-                    self.add_frame(x, y)
+                    self.add_frame(*divmod(cell, columns))
 
                 # Update current position
-                if possible_directions[0] == Maze.NORTH:
-                    x = x - 1
-                elif possible_directions[0] == Maze.EAST:
-                    y = y + 1
-                elif possible_directions[0] == Maze.SOUTH:
-                    x = x + 1
-                else:
-                    y = y - 1
-        
+                cell = possible_directions[0]
+                continue
+
+            # Hunt: the first unvisited cell with a visited neighbor (the first unvisited one has one, unless the walk did not
+            # start at (0, 0) or there are inactive cells)
+            hunted = visited.find(0, hunted)
+            candidate = hunted
+            while candidate != -1:
+                possible_directions = [other for other in adjacent[candidate] if visited[other]]
+                if len(possible_directions) != 0:
+                    break
+                candidate = visited.find(0, candidate + 1)
+            if candidate == -1:
+                break
+
+            cell = candidate
+            random.shuffle(possible_directions)
+            self.carve(*divmod(cell, columns), *divmod(possible_directions[0], columns))
+            if gif:
+                self.add_frame(*divmod(cell, columns))
+
+        self.flush()
         if gif:
-            self.add_frame(x, y)
+            self.add_frame(*divmod(cell, columns))
 
 class DepthFirstSearch(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False, x: int = 0, y: int = 0, randomized: bool = True, biased_dirs: list = None, biased_level: int = 0) -> None:
@@ -191,7 +210,7 @@ class DepthFirstSearch(Sculptor):
         if gif:
             self.add_frame(x, y)
 
-        visited = np.zeros((maze.rows, maze.columns))
+        visited = np.zeros((maze.rows, maze.columns), dtype=bool)
         stack = list()
 
         stack.append((-1, -1, x, y))
@@ -205,7 +224,7 @@ class DepthFirstSearch(Sculptor):
             visited[x][y] = 1
 
             if from_x != -1 and from_y != -1:
-                maze.path_to_cell(from_x, from_y, x, y)
+                self.carve(from_x, from_y, x, y)
                 if gif:
                     self.add_frame(x, y)
             
@@ -258,69 +277,69 @@ class DepthFirstSearch(Sculptor):
             for dir in possible_directions:
                 (to_x, to_y) = dir
                 stack.append((x, y, to_x, to_y))
-                
+
+        self.flush()
         if gif:
             self.add_frame(0, 0)
             
 class RandomKruskal(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        '''
+        Randomized Kruskal: the walls between active cells are tried in a random order and removed unless the cells on
+        both sides are already connected, which a DisjointSet over the cell ids (x * columns + y) tells.
+        '''
         super().__init__(maze, seed, gif)
         
         if gif:
             self.add_frame(0, 0)
 
-        list_of_cells = []
-        for i in range(maze.rows):
-            for j in range(maze.columns):
-                list_of_cells.append([ [i, j] ])
-        
-        list_of_edges = []
-        for i in range(maze.rows):
-            for j in range(maze.columns):
-                if maze.is_valid_position(i-1, j):
-                    list_of_edges.append((i, j, i-1, j))
-                if maze.is_valid_position(i+1, j):
-                    list_of_edges.append((i, j, i+1, j))
-                if maze.is_valid_position(i, j-1):
-                    list_of_edges.append((i, j, i, j-1))
-                if maze.is_valid_position(i, j+1):
-                    list_of_edges.append((i, j, i, j+1))
-        
-        random.shuffle(list_of_edges)
-        for edge in list_of_edges:
-            x1, y1, x2, y2 = edge
-
-            # Find cell_set for (x1, y1)
-            cell_set_1 = list_of_cells[0]
-            for cell_set in list_of_cells:
-                if [x1, y1] in cell_set:
-                    cell_set_1 = cell_set
-                    break
-            # Find cell_set for (x2, y2)
-            cell_set_2 = list_of_cells[0]
-            for cell_set in list_of_cells:
-                if [x2, y2] in cell_set:
-                    cell_set_2 = cell_set
-                    break
-            
-            
-            if cell_set_1 != cell_set_2:
-                new_cell_list = cell_set_1 + cell_set_2
-                new_cell_list = new_cell_list.copy()
-                list_of_cells.append(new_cell_list)
-                list_of_cells.remove(cell_set_1)
-                list_of_cells.remove(cell_set_2)
-
-                maze.path_to_cell(x1, y1, x2, y2)
+        # Each wall once, as the cell it belongs to and its direction: 1 (EAST) or 2 (SOUTH)
+        columns = maze.columns
+        active = maze.get_active_mask()
+        ids = np.arange(maze.rows * columns).reshape((maze.rows, columns))
+        east = ids[:, :-1][active[:, :-1] & active[:, 1:]]
+        south = ids[:-1, :][active[:-1, :] & active[1:, :]]
+        cells = np.concatenate((east, south))
+        directions = np.concatenate((np.full(len(east), 1), np.full(len(south), 2)))
+
+        order = self.rng.permutation(len(cells))
+        (cells, directions) = (cells[order], directions[order])
+        others = cells + np.where(directions == 1, 1, columns)
+
+        sets = DisjointSet(maze.rows * columns)
+        carved = []
+        # A spanning tree of the active cells has one wall less than them: no wall after that can be removed
+        remaining = int(active.sum()) - 1
+        for (k, cell, other) in zip(range(len(cells)), cells.tolist(), others.tolist()):
+            if remaining <= 0:
+                break
+            if sets.union(cell, other):
+                carved.append(k)
+                remaining -= 1
                 if gif:
+                    ((x1, y1), (x2, y2)) = (divmod(cell, columns), divmod(other, columns))
+                    self.carve(x1, y1, x2, y2)
                     self.add_frame(x1, y1)
                     self.add_frame(x2, y2)
 
+        if not gif:
+            carved = np.array(carved, dtype=np.intp)
+            maze.carve_edges(cells[carved] // columns, cells[carved] % columns, directions[carved], validate=False)
+        self.flush()
+
 class AldousBroder(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        '''
+        Random walk over the maze, carving into every cell the first time it is reached, until all active cells are.
+        The walk prefers unvisited neighbors when there are any, so the mazes are not exactly uniform spanning trees (see Wilson).
+        '''
         super().__init__(maze, seed, gif)
 
-        visited = np.full((maze.rows, maze.columns), False)
+        columns = maze.columns
+        # Active neighbors of each cell (cell ids x * columns + y), in the NORTH, EAST, SOUTH, WEST order
+        adjacent = neighbor_table(np.zeros((maze.rows, columns), dtype=np.uint8), maze.get_active_mask()).tolist()
+        adjacent = [[other for other in row if other != -1] for row in adjacent]
+        visited = bytearray(maze.rows * columns)
 
         # Random start position
         x = random.randint(0, maze.rows-1)
@@ -328,35 +347,84 @@ class AldousBroder(Sculptor):
 
         if gif:
             self.add_frame(x, y)
-        while not np.all(visited):
-            visited[x][y] = True
-
-            possible_directions = []
-            if maze.is_valid_position(x-1, y):
-                possible_directions.append((x-1, y))
-            if maze.is_valid_position(x, y+1):
-                possible_directions.append((x, y+1))
-            if maze.is_valid_position(x+1, y):
-                possible_directions.append((x+1, y))
-            if maze.is_valid_position(x, y-1):
-                possible_directions.append((x, y-1))
 
+        # Cells left to visit, instead of checking the whole visited array at every step
+        cell = x * columns + y
+        visited[cell] = 1
+        remaining = int(maze.get_active_mask().sum()) - 1
+        while remaining > 0:
+            possible_directions = adjacent[cell][:]
             random.shuffle(possible_directions)
-            found_dir = False
-            for dir in possible_directions:
-                if not visited[dir[0]][dir[1]]:
+            for other in possible_directions:
+                if not visited[other]:
+                    (x, y) = divmod(cell, columns)
                     if gif:
                         self.add_frame(x, y)
-                    maze.path_to_cell(x, y, dir[0], dir[1])
-                    
-                    x, y = dir
-                    found_dir = True
+                    self.carve(x, y, *divmod(other, columns))
+
+                    cell = other
+                    visited[cell] = 1
+                    remaining -= 1
                     break
-            
-            if not found_dir:
+            else:
                 if gif:
+                    self.add_frame(*divmod(cell, columns))
+                cell = possible_directions[0]
+
+        self.flush()
+
+class Wilson(Sculptor):
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        '''
+        Wilson's algorithm: uniform spanning tree mazes (every perfect maze is as likely), through loop-erased random walks.\n
+        The tree starts from a random cell. Then, from every cell not in the tree yet (in a random order), a random walk goes on
+        until it hits the tree. Only the last direction the walk left each cell in is kept, which erases its loops, and the
+        path it leaves is added to the tree.
+        The active cells must be connected, otherwise the walks never end.
+        '''
+        super().__init__(maze, seed, gif)
+
+        columns = maze.columns
+        # The neighbor table of the maze without any wall: every active neighbor of each cell
+        adjacent = neighbor_table(np.zeros((maze.rows, columns), dtype=np.uint8), maze.get_active_mask()).tolist()
+        choices = [[d for (d, other) in enumerate(row) if other != -1] for row in adjacent]
+        cells = np.flatnonzero(maze.get_active_mask()).astype(np.int64)
+        if len(cells) == 0:
+            return
+        cells = self.rng.permutation(cells).tolist()
+
+        in_tree = bytearray(maze.rows * columns)
+        in_tree[cells[0]] = 1
+        if gif:
+            self.add_frame(*divmod(cells[0], columns))
+
+        # leave[cell]: direction the current walk last left @cell in
+        leave = [0] * (maze.rows * columns)
+        carved = []
+        draw = random.random
+        for start in cells[1:]:
+            cell = start
+            while not in_tree[cell]:
+                moves = choices[cell]
+                d = moves[int(draw() * len(moves))]
+                leave[cell] = d
+                cell = adjacent[cell][d]
+
+            cell = start
+            while not in_tree[cell]:
+                in_tree[cell] = 1
+                d = leave[cell]
+                carved.append(cell * 4 + d)
+                if gif:
+                    (x, y) = divmod(cell, columns)
+                    self.carve(x, y, x + Maze.DIRECTIONS[d].x, y + Maze.DIRECTIONS[d].y)
                     self.add_frame(x, y)
-                x, y = possible_directions[0]
+                cell = adjacent[cell][d]
+
+        if not gif:
+            (cells, directions) = np.divmod(np.array(carved, dtype=np.intp), 4)
+            maze.carve_edges(cells // columns, cells % columns, directions, validate=False)
+        self.flush()
 
 class RandomCarving(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False, original_chance:int = 0.05, multicell:bool = True, adaptive:bool = True, adaptive_function = None) -> None:
@@ -403,7 +471,7 @@ class RandomCarving(Sculptor):
                 if multicell:
                     for dir in valid_dir:
                         if random.random() < chance:
-                            maze.path(row, col, dir)
+                            self.carve(row, col, row + dir.x, col + dir.y)
                             streak = 0
                             chance = original_chance
                         else:
@@ -414,7 +482,7 @@ class RandomCarving(Sculptor):
                 else:
                     random.shuffle(valid_dir)
                     if random.random() < chance:
-                        maze.path(row, col, valid_dir[0])
+                        self.carve(row, col, row + valid_dir[0].x, col + valid_dir[0].y)
                         streak = 0
                         chance = original_chance
                     else:
@@ -422,6 +490,8 @@ class RandomCarving(Sculptor):
                         if adaptive:
                             chance = adaptive_function(original_chance, streak)
 
+        self.flush()
+
     def __adaptive_function__(self, chance: float, streak: int) -> float:
         return chance + streak * 0.3
     
@@ -504,7 +574,7 @@ class Spiral(Sculptor):
                     break
                 
                 visited.add((x, y))
-                maze.path(x, y, _dir)
+                self.carve(x, y, x_next, y_next)
                 length += 1
 
                 x = x_next
@@ -536,43 +606,61 @@ class Spiral(Sculptor):
                     j = 0
                     i += 1
 
+        self.flush()
+
 class Sidewinder(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        '''
+        The first row is carved all the way to the East. In the other rows, each cell carves to the East with a coin flip;
+        the cells carved together form a run, and once a run stops (tails, or the last column), one of its cells chosen at
+        random carves to the North.\n
+        All coins are flipped at once, the runs are found with cumulative operations and the walls written with Maze.set_wall_bits().
+        With @gif, the same walls are carved cell by cell instead, to get the frames.
+        '''
         super().__init__(maze, seed, gif)
 
-        if gif:
-            self.add_frame(0, 0)
-
-        
-        # The first row needs to be fully carved to the east
-        for i in range(maze.columns):
-            if maze.is_valid_position(0, i+1):
-                maze.path(0, i, Maze.EAST)
-            if gif:
-                self.add_frame(0, i)
+        (rows, columns) = (maze.rows, maze.columns)
+        active = maze.get_active_mask()
+        east_ok = active[:, :-1] & active[:, 1:]
+        east = east_ok.copy()
+        east[1:] &= self.rng.random((rows - 1, columns - 1), dtype=np.float32) > 0.5
+
+        # Runs of the rows below the first one, as flat cell ids: each ends where a cell does not carve East,
+        # the last column always does, so runs never span two rows
+        stops = np.ones((rows - 1, columns), dtype=bool)
+        stops[:, :-1] = ~east[1:]
+        ends = np.flatnonzero(stops) + columns
+        starts = np.concatenate(([columns], ends + 1))[:len(ends)]
+        chosen = starts + (self.rng.random(len(ends)) * (ends - starts + 1)).astype(np.int64)
+        north = np.zeros((rows, columns), dtype=bool)
+        north.ravel()[chosen] = True
+        north[1:] &= active[1:] & active[:-1]
+
+        if not gif:
+            maze.set_wall_bits(~np.concatenate((east.ravel(), north[1:, :].ravel())))
+            return
 
+        self.add_frame(0, 0)
+        # The cell of each run carving North, by the last cell of the run
+        run_cell = dict(zip(ends.tolist(), chosen.tolist()))
+        for i in range(rows):
+            for j in range(columns):
+                if j + 1 < columns and east[i, j]:
+                    self.carve(i, j, i, j+1)
+                elif i > 0 and north.ravel()[run_cell[i * columns + j]]:
+                    (x, y) = divmod(run_cell[i * columns + j], columns)
+                    self.carve(x, y, x-1, y)
+                self.add_frame(i, j)
 
-        run = []
-        for i in range(1, maze.rows):
-            run.clear()
-            for j in range(maze.columns):
-                run.append((i, j))
-                
-                # Can we carve EAST?
-                if maze.is_valid_position(i, j+1) and random.random() > 0.5:
-                        maze.path(i, j, Maze.EAST)
-                else:
-                    cell = random.choice(run)
-                    maze.path(cell[0], cell[1], Maze.NORTH)
-                    run.clear()
-                
-                if gif:
-                    self.add_frame(i, j)
+        self.flush()
 
 class RandomPrim(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False, x: int = None, y: int = None) -> None:
         '''
-        If @x and @y are left as None, they start off from the center of the maze.
+        If @x and @y are left as None, they start off from the center of the maze.\n
+        The frontier holds the walls between a visited cell and an unvisited one, as cell id (x * columns + y) * 4 + direction.
+        A random one is taken out by swapping it with the last one, walls whose other cell got visited in the meantime are skipped,
+        and only the walls of each newly visited cell are added.
         '''
         super().__init__(maze, seed, gif)
 
@@ -582,48 +670,51 @@ class RandomPrim(Sculptor):
         if gif:
             self.add_frame(x, y)
 
-        visited = set()
-        
-        visited.add((x, y))
-        frontier = []
-        while len(visited) != maze.rows * maze.columns:
-            # Iterate through the visited array and add all cells that have an unvisited neighbor
-            for (x, y) in visited:
-                # Check all neighbors of (x, y)
-                if (x-1, y) not in visited and maze.is_valid_position(x-1, y) and (x, y, x-1, y) not in frontier:
-                    frontier.append((x, y, x-1, y))
-                if (x, y+1) not in visited and maze.is_valid_position(x, y+1) and (x, y, x, y+1) not in frontier:
-                    frontier.append((x, y, x, y+1))
-                if (x+1, y) not in visited and maze.is_valid_position(x+1, y) and (x, y, x+1, y) not in frontier:
-                    frontier.append((x, y, x+1, y))
-                if (x, y-1) not in visited and maze.is_valid_position(x, y-1) and (x, y, x, y-1) not in frontier:
-                    frontier.append((x, y, x, y-1))
-
-            if len(frontier) == 0:
-                raise ValueError(f"It seems that frontier has a length of 0. Here is what I known.\nvisited = {visited}")
-
-            # Find a pair of visited_cell and unvisited_cell in frontier
-            random.shuffle(frontier)
-
-            for x1, y1, x2, y2 in frontier:
-                if (x2, y2) not in visited:
-                    break
+        columns = maze.columns
+        # The neighbor table of the maze without any wall: every active neighbor of each cell
+        adjacent = neighbor_table(np.zeros((maze.rows, columns), dtype=np.uint8), maze.get_active_mask()).tolist()
+        visited = bytearray(maze.rows * columns)
+        carved = []
+
+        start = x * columns + y
+        visited[start] = 1
+        frontier = [start * 4 + d for (d, other) in enumerate(adjacent[start]) if other != -1]
+        draw = random.random
+        while frontier:
+            index = int(draw() * len(frontier))
+            wall = frontier[index]
+            frontier[index] = frontier[-1]
+            frontier.pop()
+
+            (cell, d) = divmod(wall, 4)
+            other = adjacent[cell][d]
+            if visited[other]:
+                continue
+            visited[other] = 1
+            carved.append(wall)
 
             if gif:
+                ((x1, y1), (x2, y2)) = (divmod(cell, columns), divmod(other, columns))
                 self.add_frame(x1, y1)
+                self.carve(x1, y1, x2, y2)
+                self.add_frame(x2, y2)
 
-            maze.path_to_cell(x1, y1, x2, y2)
-            visited.add((x2, y2))
+            for (d, neighbor) in enumerate(adjacent[other]):
+                if neighbor != -1 and not visited[neighbor]:
+                    frontier.append(other * 4 + d)
 
-            if gif:
-                self.add_frame(x2, y2)
+        if not gif:
+            (cells, directions) = np.divmod(np.array(carved, dtype=np.intp), 4)
+            maze.carve_edges(cells // columns, cells % columns, directions, validate=False)
+        self.flush()
 
 class RecursiveDivision(Sculptor):
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
         super().__init__(maze, seed, gif)
 
         self.__recursive_division__(0, maze.rows-1, 0, maze.columns-1)
-        
+        self.flush()
+
         # Because the algorithm work by adding walls, we toggle them at the end
         maze.toggle()
 
@@ -649,7 +740,7 @@ class RecursiveDivision(Sculptor):
             random_wall_column = random.randint(start_column, end_column)
             for i in range(start_column, end_column+1):
                 if i != random_wall_column:
-                    self.maze.path(wall_index-1, i, Maze.SOUTH)
+                    self.carve(wall_index-1, i, wall_index, i)
             
             self.__recursive_division__(start_row, wall_index-1, start_column, end_column)
             self.__recursive_division__(wall_index, end_row, start_column, end_column)
@@ -660,7 +751,7 @@ class RecursiveDivision(Sculptor):
             random_wall_row = random.randint(start_row, end_row)
             for i in range(start_row, end_row+1):
                 if i != random_wall_row:
-                    self.maze.path(i, wall_index-1, Maze.EAST)
+                    self.carve(i, wall_index-1, i, wall_index)
 
             self.__recursive_division__(start_row, end_row, start_column, wall_index-1)
             self.__recursive_division__(start_row, end_row, wall_index, end_column)
@@ -697,19 +788,16 @@ class WallsCellularAutomata(Sculptor):
         if gif:
             self.add_frame()
 
-        bitstring = maze.get_wall_bitstring()
-        new_bitstring = []
+        # rules[f"{k:03b}"] as a lookup table indexed by the neighborhood k = 4 * left + 2 * center + right
+        table = np.array([rules[f"{k:03b}"] != "0" for k in range(8)])
+
+        bits = maze.get_wall_bits()
         for gen in range(generations):
-            bitstring = ["1" if random.random() > 0.5 else "0"] + bitstring + ["1" if random.random() > 0.5 else "0"]
-            new_bitstring.clear()
+            bits = np.concatenate(([random.random() > 0.5], bits, [random.random() > 0.5]))
+            bits = table[4 * bits[:-2] + 2 * bits[1:-1] + bits[2:]]
 
-            for i in range(len(bitstring) - 2):
-                neighbors = "".join([bitstring[1+i+j] for j in (-1, 0, 1)])
-                new_bitstring += rules[neighbors]
-            
-            bitstring = new_bitstring
             self.maze.reset()
-            self.maze.set_wall_bitstring(bitstring)
+            self.maze.set_wall_bits(bits)
             if gif:
                 self.add_frame()
 
@@ -720,7 +808,10 @@ class WallsCellularAutomata(Sculptor):
         self.frames.append(frame)
 
 class GeneticAlgorithm(Sculptor):
-    
+
+    # Score of a cell with 0, 1, 2, 3 or 4 walls
+    INTERSECTION_SCORES = np.array([-0.1, 0.1, 0.4, 0.2, -1])
+
     def __init__(self, maze: Maze, seed: int = None, gif: bool = False, parameters:dict = None, autorun:bool=True) -> None:
         '''
         Class that uses a genetic algorithm to evolve a maze. It heavy relies on the @parameters dictionary, so make
@@ -761,19 +852,15 @@ class GeneticAlgorithm(Sculptor):
         Runs the GA algorithm. If needed, this function can be overridden.
         '''
 
-        self.best_individual_all = ''
+        self.best_individual_all = None
         self.best_score_all = 0
         self.gen_change = 0
 
         for gen in range(1, self.GENERATIONS):
             print(f"[ GeneticAlgorithm ][ run ] Generation: {gen} / {self.GENERATIONS+1}")
-            scores = []
+            assert self.POPULATION.shape == (self.POP_SIZE, self.CHROMOSOME_LENGTH), f"Population has shape {self.POPULATION.shape}"
 
-            for index in range(self.POP_SIZE):
-                individual = self.POPULATION[index]
-                assert isinstance(individual, list), f"Individual is of type {type(individual)}"
-                
-                scores.append((index, self.fitness(individual)))
+            scores = list(enumerate(self.population_fitness(self.POPULATION)))
 
             self.sorted_scores = sorted(scores, key=lambda item: item[1])
 
@@ -786,9 +873,6 @@ class GeneticAlgorithm(Sculptor):
                 self.best_individual_all = best_individual
                 self.gen_change = gen
 
-            # Clear previously best population
-            self.new_population = []
-
             self.selection()
 
             self.crossover()
@@ -806,108 +890,68 @@ class GeneticAlgorithm(Sculptor):
                 self.add_frame
 
         self.maze.reset()
-        self.maze.set_wall_bitstring(self.best_individual_all)
+        if self.best_individual_all is not None:
+            self.maze.set_wall_bits(self.best_individual_all)
 
-    def create_population(self, initial_population:list, mutation_chance:float, pop_size:int) -> list:
-        
+    def create_population(self, initial_population:list, mutation_chance:float, pop_size:int) -> np.ndarray:
+        '''
+        Returns the population as a (pop_size, chromosome length) boolean array, one individual per row (see Maze.get_wall_bits()).\n
+        @initial_population: individuals given as bitstring lists, boolean arrays or packed uint8 arrays. If empty,
+        the population is created by mutating the bitstring of the maze with @mutation_chance.
+        '''
         # Population is given
         if len(initial_population) > 0:
+            if isinstance(initial_population, np.ndarray) or isinstance(initial_population[0], np.ndarray):
+                return np.array(unpack_wall_bits(np.asarray(initial_population), self.maze.rows, self.maze.columns))
             if isinstance(initial_population[0], list):
-                return initial_population
-            else:
-                raise RuntimeError(f"[ GeneticAlgorithm ][ create_population ] Individuals from a population must be list objects.")
-        
+                return np.array([[bit != "0" for bit in idv] for idv in initial_population])
+            raise RuntimeError(f"[ GeneticAlgorithm ][ create_population ] Individuals from a population must be list or np.ndarray objects.")
+
         # No population given, randomly create one based on the bitstring of the maze
-        if len(initial_population) == 0:
-            population = []
-            bitstring = self.maze.get_wall_bitstring()
-            bitstring = "".join(bitstring)
-            for i in range(pop_size):
-                new_bitstring = []
-                for j in bitstring:
-                    if random.random() < mutation_chance:
-                        new_bitstring.append("0") if j == "1" else new_bitstring.append("1")
-                    else:
-                        new_bitstring.append(j)
-                population.append(new_bitstring)
-            
-            return population
-        
-        raise RuntimeError(f"[GeneticAlgorithm] Something went wrong with population creation. Population: {population}")
+        bits = self.maze.get_wall_bits()
+        return bits ^ (self.rng.random((pop_size, len(bits))) < mutation_chance)
 
     def fitness(self, idv=list):
-        # In the future, this process could be optimized
-        # to use only the bitstring without creating a new maze.
-        new_maze = Maze(self.maze.rows, self.maze.columns)
-
-        new_maze.set_wall_bitstring(idv)
-
-        intersection_score = 0
-        for i in range(new_maze.rows):
-            for j in range(new_maze.columns):
-                walls = 0
-                for wall in (Maze.NORTH, Maze.EAST, Maze.SOUTH, Maze.WEST):
-                    if new_maze.data[i][j].walls[wall]:
-                        walls += 1
-                if walls == 0:
-                    intersection_score += -0.1
-                if walls == 1:
-                    intersection_score += 0.1
-                if walls == 2:
-                    intersection_score += 0.4
-                if walls == 3:
-                    intersection_score += 0.2
-                if walls == 4:
-                    intersection_score += -1
-
-        # M_3
-        curr_score = intersection_score / (new_maze.rows * new_maze.columns)
-        areas = flood_fill(new_maze)
+        return self.population_fitness(self.create_population([idv], 0, 1))[0]
+
+    def population_fitness(self, population:np.ndarray) -> list:
+        '''
+        Evaluates all individuals at once, using a single MazeBatch instead of a new maze per individual.
+        '''
+        batch = MazeBatch(len(population), self.maze.rows, self.maze.columns)
+        batch.set_wall_bits(np.asarray(population))
+
+        # M_3: score each cell based on its number of walls
+        intersection_score = self.INTERSECTION_SCORES[ArrayMaze.WALL_COUNT[batch.walls]].sum(axis=(1, 2))
+        curr_score = intersection_score / (self.maze.rows * self.maze.columns)
 
         # M_5
+        areas = batch.count_areas()
         curr_score = curr_score + 1 / areas
 
-        return curr_score
+        return curr_score.tolist()
 
     def selection(self):
         total_fitness = sum(_[1] for _ in self.sorted_scores)
         probabilities = [f / total_fitness for _, f in self.sorted_scores]
-
-        cumulative_probabilities = [0]
-        cumulative_sum = 0
-        for p in probabilities:
-            cumulative_sum += p
-            cumulative_probabilities.append(cumulative_sum)
+        cumulative_probabilities = np.concatenate(([0], np.cumsum(probabilities)))
 
         # Selection using roulette wheel
-        for i in range(self.POP_SIZE):
-            spin = random.random()
-            for j in range(self.POP_SIZE):
-                if cumulative_probabilities[j] <= spin and spin < cumulative_probabilities[j+1]:
-                    self.new_population.append(self.POPULATION[j])
-                    break
+        spins = self.rng.random(self.POP_SIZE)
+        positions = np.searchsorted(cumulative_probabilities, spins, side="right") - 1
+        self.new_population = self.POPULATION[positions[positions < self.POP_SIZE]]
 
     def crossover(self):
         for i in range(0, self.POP_SIZE, 2):
-            if random.random() < self.CROSSOVER_CHANCE:
-                crossover_point = random.randint(1, self.CHROMOSOME_LENGTH-1)
+            if self.rng.random() < self.CROSSOVER_CHANCE:
+                crossover_point = self.rng.integers(1, self.CHROMOSOME_LENGTH)
 
-                x = self.new_population[i][:crossover_point] + self.new_population[i+1][crossover_point:]
-                y = self.new_population[i+1][:crossover_point] + self.new_population[i][crossover_point:]
-
-                self.new_population[i] = x
-                self.new_population[i+1] = y
+                tail = self.new_population[i, crossover_point:].copy()
+                self.new_population[i, crossover_point:] = self.new_population[i+1, crossover_point:]
+                self.new_population[i+1, crossover_point:] = tail
 
     def mutation(self):
-        for i in range(self.POP_SIZE):
-            for j in range(self.CHROMOSOME_LENGTH):
-                if random.random() < self.MUTATION_CHANCE:
-                    if self.new_population[i][j] == "0":
-                        self.new_population[i][j] = "1"
-                    elif self.new_population[i][j] == "1":
-                        self.new_population[i][j] = "0"
-                    else:
-                        raise ValueError(f"[ GA ] What :keklmao: {self.new_population[i][j]}")
+        self.new_population ^= self.rng.random(self.new_population.shape) < self.MUTATION_CHANCE
 
     def elitism(self):
         for k in range(self.K_ELITISM):
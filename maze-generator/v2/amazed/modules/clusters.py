@@ -0,0 +1,217 @@
+import heapq
+import numpy as np
+
+from amazed.modules.maze import Maze
+from amazed.modules.solver import bfs_distances
+
+
+class ClusterGraph:
+    '''
+    Hierarchical (HPA*-style) abstraction of a maze, for shortest paths in very large mazes.\n
+    The maze is cut into square clusters of @size x @size cells. Every cell with an open wall towards another cluster is an
+    entrance, and the distances between the entrances of each cluster (moving inside that cluster only) are computed
+    up front. path() searches the small graph of entrances and only runs cell level searches inside the clusters at both
+    ends and along the chosen route. Every open border wall is its own entrance, so the paths are exactly shortest.\n
+    Maze.path() and Maze.wall() update the clusters next to the changed wall (see update()), any other change rebuilds
+    everything on the next Maze.cluster_graph() call.
+    '''
+
+    def __init__(self, maze: Maze, size: int = 16):
+        self.maze = maze
+        self.size = size
+        self.cluster_rows = -(-maze.rows // size)
+        self.cluster_columns = -(-maze.columns // size)
+        self.revision = maze.revision
+
+        neighbors = maze.neighbors()
+        count = self.cluster_rows * self.cluster_columns
+        cluster = self.cluster_of(np.arange(len(neighbors)))
+
+        # A move to another cluster makes the cell an entrance; the search inside clusters uses the table without these moves
+        crossing = (neighbors != -1) & (cluster[neighbors] != cluster[:, None])
+        inside = np.where(crossing, -1, neighbors)
+
+        # Entrances grouped by cluster; local[cell] is the index of an entrance within its cluster (-1 for other cells)
+        entrances = np.flatnonzero(crossing.any(axis=1))
+        entrances = entrances[np.argsort(cluster[entrances], kind="stable")]
+        counts = np.bincount(cluster[entrances], minlength=count)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        self.local = np.full(len(neighbors), -1, dtype=np.int32)
+        self.local[entrances] = np.arange(len(entrances)) - starts[cluster[entrances]]
+
+        # distances[c][i, j]: moves from the i-th to the j-th entrance of cluster c without leaving it (-1 if impossible).
+        # Round k searches from the k-th entrance of every cluster at once: the clusters are not connected in @inside.
+        offsets = np.concatenate(([0], np.cumsum(counts ** 2)))
+        buffer = np.full(offsets[-1], -1, dtype=np.int32)
+        owner = cluster[entrances]
+        for k in range(counts.max(initial=0)):
+            rows = counts[owner] > k
+            sources = entrances[starts[np.flatnonzero(counts > k)] + k]
+            distance = bfs_distances(inside, sources)
+            targets = entrances[rows]
+            buffer[offsets[owner[rows]] + k * counts[owner[rows]] + self.local[targets]] = distance[targets]
+
+        self.entrances = [entrances[starts[c]:starts[c] + counts[c]] for c in range(count)]
+        self.distances = [buffer[offsets[c]:offsets[c + 1]].reshape((counts[c], counts[c])) for c in range(count)]
+
+    def cluster_of(self, cell):
+        '''
+        Cluster index of a cell id (or of an array of cell ids), clusters being numbered row by row.
+        '''
+        (x, y) = (cell // self.maze.columns, cell % self.maze.columns)
+        return (x // self.size) * self.cluster_columns + y // self.size
+
+    def _search(self, source: int, target: int = None) -> tuple:
+        '''
+        BFS from @source that does not leave its cluster (stops early once @target is reached).
+        Returns (distance, parent), two dicts keyed by cell id.
+        '''
+        neighbors = self.maze.neighbors()
+        cluster = self.cluster_of(source)
+        distance = {source: 0}
+        parent = {source: -1}
+        queue = [source]
+        for cell in queue:
+            if cell == target:
+                break
+            for neighbor in neighbors[cell].tolist():
+                if neighbor != -1 and neighbor not in distance and self.cluster_of(neighbor) == cluster:
+                    distance[neighbor] = distance[cell] + 1
+                    parent[neighbor] = cell
+                    queue.append(neighbor)
+        return (distance, parent)
+
+    def _refine(self, source: int, target: int) -> list:
+        '''
+        Cells from @source to @target (both included), two cells of the same cluster.
+        '''
+        (_, parent) = self._search(source, target)
+        cells = [target]
+        while cells[-1] != source:
+            cells.append(parent[cells[-1]])
+        return cells[::-1]
+
+    def update(self, x: int, y: int, direction):
+        '''
+        Recomputes the entrances and the distances of the clusters on both sides of the wall of (@x, @y) in @direction,
+        after it changed. Called by Maze.path() and Maze.wall() when the graph is up to date.
+        '''
+        neighbors = self.maze.neighbors()
+        a = x * self.maze.columns + y
+        clusters = {self.cluster_of(a)}
+        if 0 <= x + direction.x < self.maze.rows and 0 <= y + direction.y < self.maze.columns:
+            clusters.add(self.cluster_of(a + direction.x * self.maze.columns + direction.y))
+
+        for c in clusters:
+            self.local[self.entrances[c]] = -1
+            (cx, cy) = divmod(c, self.cluster_columns)
+            xs = np.arange(cx * self.size, min((cx + 1) * self.size, self.maze.rows))
+            ys = np.arange(cy * self.size, min((cy + 1) * self.size, self.maze.columns))
+            cells = (xs[:, None] * self.maze.columns + ys[None, :]).ravel()
+
+            targets = neighbors[cells]
+            crossing = (targets != -1) & (self.cluster_of(targets) != c)
+            entrances = cells[crossing.any(axis=1)]
+            self.local[entrances] = np.arange(len(entrances))
+
+            distances = np.full((len(entrances), len(entrances)), -1, dtype=np.int32)
+            for (i, entrance) in enumerate(entrances.tolist()):
+                (distance, _) = self._search(entrance)
+                distances[i] = [distance.get(other, -1) for other in entrances.tolist()]
+            self.entrances[c] = entrances
+            self.distances[c] = distances
+        self.revision = self.maze.revision
+
+    def path(self, start: tuple, end: tuple) -> list:
+        '''
+        Shortest path from @start to @end, as a list of cell ids (x * columns + y), both included.\n
+        A* (Manhattan distance heuristic) over the entrances, starting from those reachable from @start inside its cluster
+        and ending with those reaching @end inside its cluster; the chosen route is then refined cluster by cluster.
+        Raises ValueError if there is no path.
+        '''
+        if self.revision != self.maze.revision:
+            raise ValueError("The maze changed since the cluster graph was built, use Maze.cluster_graph() to get an up to date one.")
+
+        columns = self.maze.columns
+        neighbors = self.maze.neighbors()
+        source = start[0] * columns + start[1]
+        target = end[0] * columns + end[1]
+        (endx, endy) = end
+
+        (from_source, source_parent) = self._search(source)
+        (to_target, target_parent) = self._search(target)
+
+        # Staying inside the cluster is a candidate when both cells share it
+        best = (from_source[target], None) if target in from_source else None
+
+        finish = {cell: to_target[cell] for cell in self.entrances[self.cluster_of(target)].tolist() if cell in to_target}
+        gvalue = {}
+        parent = {}
+        heap = []
+        for (seq, cell) in enumerate(self.entrances[self.cluster_of(source)].tolist()):
+            if cell in from_source:
+                gvalue[cell] = from_source[cell]
+                parent[cell] = -1
+                (x, y) = divmod(cell, columns)
+                heap.append((from_source[cell] + abs(x - endx) + abs(y - endy), from_source[cell], seq, cell))
+        heapq.heapify(heap)
+        seq = len(heap)
+
+        closed = set()
+        while heap:
+            (f, g, _, cell) = heapq.heappop(heap)
+            if best is not None and f >= best[0]:
+                break
+            if cell in closed:
+                continue
+            closed.add(cell)
+
+            if cell in finish and (best is None or g + finish[cell] < best[0]):
+                best = (g + finish[cell], cell)
+
+            # Other entrances of the same cluster, then the cells across the border
+            cluster = self.cluster_of(cell)
+            moves = zip(self.entrances[cluster].tolist(), self.distances[cluster][self.local[cell]].tolist())
+            crossings = [(neighbor, 1) for neighbor in neighbors[cell].tolist() if neighbor != -1 and self.cluster_of(neighbor) != cluster]
+            for (other, weight) in list(moves) + crossings:
+                if weight <= 0 or other in closed or (other in gvalue and gvalue[other] <= g + weight):
+                    continue
+                gvalue[other] = g + weight
+                parent[other] = cell
+                (x, y) = divmod(other, columns)
+                heapq.heappush(heap, (g + weight + abs(x - endx) + abs(y - endy), g + weight, seq, other))
+                seq += 1
+
+        if best is None:
+            raise ValueError(f"Could not find a connected path from {start} to {end}!")
+
+        if best[1] is None:
+            cells = [target]
+            while cells[-1] != source:
+                cells.append(source_parent[cells[-1]])
+            return cells[::-1]
+
+        # Entrances of the route, then the cells: the start cluster, each hop, the end cluster
+        route = [best[1]]
+        while parent[route[-1]] != -1:
+            route.append(parent[route[-1]])
+        route.reverse()
+
+        cells = [route[0]]
+        while cells[-1] != source:
+            cells.append(source_parent[cells[-1]])
+        cells.reverse()
+        for (a, b) in zip(route, route[1:]):
+            if self.cluster_of(a) == self.cluster_of(b):
+                cells.extend(self._refine(a, b)[1:])
+            else:
+                cells.append(b)
+        while cells[-1] != target:
+            cells.append(target_parent[cells[-1]])
+        return cells
+
+    def distance(self, start: tuple, end: tuple) -> int:
+        '''
+        Length of the shortest path from @start to @end (number of moves), see path().
+        '''
+        return len(self.path(start, end)) - 1
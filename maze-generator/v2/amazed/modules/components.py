@@ -0,0 +1,177 @@
+import numpy as np
+
+from amazed.modules.maze import Maze
+
+
+class DisjointSet:
+    '''
+    Union-find over the elements 0, 1, ..., @size - 1, with path compression and union by rank.
+    '''
+
+    def __init__(self, size: int, parent: list = None):
+        '''
+        @parent: optional starting forest (parent[i] == i marks a root), e.g. the result of root_labels().
+        '''
+        self.parent = list(range(size)) if parent is None else list(parent)
+        self.rank = [0] * size
+        for (element, root) in enumerate(self.parent):
+            if element != root:
+                self.rank[root] = 1
+        self.count = sum(1 for (element, root) in enumerate(self.parent) if element == root)
+
+    def find(self, element: int) -> int:
+        '''
+        Returns the root of the set holding @element. Every element on the way is then linked straight to the root.
+        '''
+        parent = self.parent
+        root = element
+        while parent[root] != root:
+            root = parent[root]
+        while parent[element] != root:
+            (parent[element], element) = (root, parent[element])
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        '''
+        Joins the sets of @a and @b (the lower ranked root goes under the other one).
+        Returns False if they already were in the same set.
+        '''
+        (a, b) = (self.find(a), self.find(b))
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            (a, b) = (b, a)
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+
+def open_edges(walls: np.ndarray, active: np.ndarray) -> tuple:
+    '''
+    All open internal walls of a (rows, columns) maze or of a (count, rows, columns) batch, as two arrays (u, v)
+    of cell ids (the ids of neighbor_table()): v is the east or south neighbor of u.
+    '''
+    ids = np.arange(walls.size, dtype=np.int64).reshape(walls.shape)
+    east = ((walls[..., :, :-1] & Maze.EAST_BIT) == 0) & active[..., :, :-1] & active[..., :, 1:]
+    south = ((walls[..., :-1, :] & Maze.SOUTH_BIT) == 0) & active[..., :-1, :] & active[..., 1:, :]
+    u = np.concatenate((ids[..., :, :-1][east], ids[..., :-1, :][south]))
+    v = np.concatenate((ids[..., :, 1:][east], ids[..., 1:, :][south]))
+    return (u, v)
+
+
+def root_labels(walls: np.ndarray, active: np.ndarray) -> np.ndarray:
+    '''
+    Union-find over all open walls at once: returns a flat array giving, for each cell, the smallest cell id of its area.\n
+    Each union hooks the larger root under the smaller one and every pass ends with full path compression,
+    so the labels are roots of a flat forest (the same forest DisjointSet(parent=...) accepts).
+    '''
+    (u, v) = open_edges(walls, active)
+
+    labels = np.arange(walls.size, dtype=np.int64)
+    while True:
+        lu = labels[u]
+        lv = labels[v]
+        different = lu != lv
+        if not different.any():
+            break
+        np.minimum.at(labels, np.maximum(lu, lv)[different], np.minimum(lu, lv)[different])
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+
+def count_areas(walls: np.ndarray, active: np.ndarray) -> np.ndarray:
+    '''
+    Counts the separate areas of each maze in a (N, rows, columns) batch of wall masks (or of a single (rows, columns) maze).\n
+    Only active cells are taken into account. Returns an int array of shape (N,) (or an int for a single maze).
+    '''
+    roots = (root_labels(walls, active) == np.arange(walls.size)).reshape(walls.shape) & active
+    return roots.sum(axis=(-2, -1))
+
+
+class Components:
+    '''
+    Connected areas of a maze, or of each maze of a batch: per-cell labels, number of areas and their sizes.\n
+    Inactive cells belong to no area (label 0). Carving walls can be followed without labelling again, see carve().
+    '''
+
+    def __init__(self, walls: np.ndarray, active: np.ndarray):
+        '''
+        @walls, @active: (rows, columns) or (count, rows, columns) arrays, see Maze.get_wall_mask() and MazeBatch.
+        '''
+        self.walls = walls
+        self.active = active
+        self.roots = root_labels(walls, active)
+        self._set = None
+
+        # Number the areas of each maze from 1, in the order their first cell is met row by row
+        (rows, columns) = walls.shape[-2:]
+        flat_active = active.reshape(-1)
+        is_root = (self.roots == np.arange(walls.size)) & flat_active
+        maze_of = np.arange(walls.size) // (rows * columns)
+        first = np.searchsorted(maze_of[is_root], maze_of, side="left")
+        numbers = np.cumsum(is_root)
+        labels = numbers[self.roots] - first
+        self.labels = np.where(flat_active, labels, 0).reshape(walls.shape)
+
+        self.counts = is_root.reshape(walls.shape).sum(axis=(-2, -1))
+
+    @classmethod
+    def from_maze(cls, maze: Maze):
+        return cls(maze.get_wall_mask(), maze.get_active_mask())
+
+    def sizes(self, index: int = None) -> np.ndarray:
+        '''
+        Number of cells of each area, as an int array where entry i - 1 is the size of the area labelled i.\n
+        @index: which maze of a batch.
+        '''
+        labels = self.labels if index is None else self.labels[index]
+        return np.bincount(labels.ravel())[1:]
+
+    def _cells(self, x: int, y: int, direction, index: int) -> tuple:
+        (rows, columns) = self.walls.shape[-2:]
+        (x2, y2) = (x + direction.x, y + direction.y)
+        if not (0 <= x < rows and 0 <= y < columns and 0 <= x2 < rows and 0 <= y2 < columns):
+            raise ValueError(f"There is no internal wall at ({x}, {y}) in direction ({direction.x}, {direction.y}).")
+        offset = 0 if self.walls.ndim == 2 else index * rows * columns
+        return (offset + x * columns + y, offset + x2 * columns + y2)
+
+    def merges(self, x: int, y: int, direction, index: int = 0) -> int:
+        '''
+        How many areas would disappear by carving the wall of (@x, @y) in @direction (e.g. Maze.NORTH): 1 if it separates
+        two different areas, otherwise 0. Neither the walls nor the labels are changed.\n
+        @index: which maze of a batch.
+        '''
+        (a, b) = self._cells(x, y, direction, index)
+        active = self.active.reshape(-1)
+        if not (active[a] and active[b]):
+            return 0
+        if self._set is None:
+            return int(self.roots[a] != self.roots[b])
+        return int(not self._set.connected(a, b))
+
+    def carve(self, x: int, y: int, direction, index: int = 0) -> int:
+        '''
+        Records that the wall of (@x, @y) in @direction was carved (the wall arrays are not changed by this),
+        updating the number of areas. Returns merges() of that wall.\n
+        Only the counts are kept up to date, labels and sizes() still describe the areas from construction.
+        '''
+        if self.merges(x, y, direction, index) == 0:
+            return 0
+        if self._set is None:
+            self._set = DisjointSet(len(self.roots), self.roots.tolist())
+        (a, b) = self._cells(x, y, direction, index)
+        self._set.union(a, b)
+        if self.walls.ndim == 2:
+            self.counts = self.counts - 1
+        else:
+            self.counts[index] -= 1
+        return 1
@@ -0,0 +1,179 @@
+import heapq
+import numpy as np
+
+from amazed.modules.maze import Maze
+
+
+class JunctionGraph:
+    '''
+    Compact graph of a maze: its nodes are the cells that do not have exactly two open neighbors (junctions, dead ends,
+    isolated cells) and every corridor of degree-2 cells between two nodes becomes a single edge, weighted by its length.\n
+    Perfect mazes are mostly corridors, so shortest paths searched on this graph (see path()) touch far fewer cells than
+    on the maze itself. Build it once and query it many times: Maze.junction_graph() keeps one per maze.
+    '''
+
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.revision = maze.revision
+
+        neighbors = maze.neighbors()
+        degree = (neighbors != -1).sum(axis=1)
+        table = neighbors.tolist()
+        size = len(table)
+
+        # node[cell] is the index of the node of that cell, or -1 for corridor cells
+        nodes = np.flatnonzero(degree != 2).tolist()
+        node = [-1] * size
+        for (index, cell) in enumerate(nodes):
+            node[cell] = index
+
+        # edges[e] is the whole cell sequence of a corridor, both end nodes included.
+        # edge_of[cell] and offset[cell] tell on which edge and where a corridor cell lies.
+        self.edges = []
+        self.adjacency = [[] for _ in nodes]
+        edge_of = [-1] * size
+        offset = [0] * size
+
+        def add_edge(cells):
+            e = len(self.edges)
+            self.edges.append(np.array(cells, dtype=np.int32))
+            for (position, cell) in enumerate(cells[1:-1], 1):
+                edge_of[cell] = e
+                offset[cell] = position
+            (a, b) = (node[cells[0]], node[cells[-1]])
+            self.adjacency[a].append((b, len(cells) - 1, e))
+            self.adjacency[b].append((a, len(cells) - 1, e))
+
+        def walk(first, second):
+            cells = [first, second]
+            while node[cells[-1]] == -1:
+                (n1, n2) = [_ for _ in table[cells[-1]] if _ != -1]
+                cells.append(n2 if n1 == cells[-2] else n1)
+            return cells
+
+        for cell in nodes:
+            for neighbor in table[cell]:
+                if neighbor == -1:
+                    continue
+                if node[neighbor] != -1:
+                    # Two adjacent nodes: add the edge once
+                    if cell < neighbor:
+                        add_edge([cell, neighbor])
+                elif edge_of[neighbor] == -1:
+                    add_edge(walk(cell, neighbor))
+
+        # Loops made only of corridor cells have no node yet: their first cell becomes one
+        for cell in range(size):
+            if node[cell] == -1 and edge_of[cell] == -1:
+                node[cell] = len(nodes)
+                nodes.append(cell)
+                self.adjacency.append([])
+                add_edge(walk(cell, next(_ for _ in table[cell] if _ != -1)))
+
+        self.nodes = np.array(nodes, dtype=np.int32)
+        self.node = np.array(node, dtype=np.int32)
+        self.coordinates = [divmod(cell, maze.columns) for cell in nodes]
+        self.edge_of = np.array(edge_of, dtype=np.int32)
+        self.offset = np.array(offset, dtype=np.int32)
+
+    def _exits(self, cell: int) -> list:
+        '''
+        Nodes a search starting from (or ending at) @cell enters the graph through, as (node, distance, cells from @cell to node).
+        '''
+        if self.node[cell] != -1:
+            return [(int(self.node[cell]), 0, [cell])]
+        cells = self.edges[self.edge_of[cell]]
+        position = int(self.offset[cell])
+        backward = cells[position::-1].tolist()
+        forward = cells[position:].tolist()
+        return [(int(self.node[backward[-1]]), position, backward), (int(self.node[forward[-1]]), len(cells) - 1 - position, forward)]
+
+    def path(self, start: tuple, end: tuple) -> list:
+        '''
+        Shortest path from @start to @end, as a list of cell ids (x * columns + y), both included.\n
+        A* over the nodes (Manhattan distance heuristic, which never overestimates a corridor), entering and leaving
+        the graph through the nodes at both ends of the corridors of @start and @end. Raises ValueError if there is no path.
+        '''
+        if self.revision != self.maze.revision:
+            raise ValueError("The maze changed since the junction graph was built, use Maze.junction_graph() to get an up to date one.")
+
+        columns = self.maze.columns
+        source = start[0] * columns + start[1]
+        target = end[0] * columns + end[1]
+        (endx, endy) = end
+
+        def h(index):
+            (x, y) = self.coordinates[index]
+            return abs(x - endx) + abs(y - endy)
+
+        if source == target:
+            return [source]
+
+        best = None
+        # Both cells on the same corridor: going straight along it is a candidate
+        if self.node[source] == -1 and self.edge_of[source] == self.edge_of[target]:
+            cells = self.edges[self.edge_of[source]]
+            (i, j) = (int(self.offset[source]), int(self.offset[target]))
+            best = (abs(i - j), (cells[i:j + 1] if i <= j else cells[j:i + 1][::-1]).tolist())
+
+        # Reaching node n leaves the graph towards @end with finish[n] = (distance, cells from n to @end)
+        finish = {}
+        for (index, distance, cells) in self._exits(target):
+            if index not in finish or distance < finish[index][0]:
+                finish[index] = (distance, cells[::-1])
+
+        gvalue = {}
+        parent = {}
+        heap = []
+        seq = 0
+        for (index, distance, cells) in self._exits(source):
+            if index not in gvalue or distance < gvalue[index]:
+                gvalue[index] = distance
+                parent[index] = (None, cells)
+                heapq.heappush(heap, (distance + h(index), distance, seq, index))
+                seq += 1
+
+        closed = set()
+        while heap:
+            (f, g, _, index) = heapq.heappop(heap)
+            if best is not None and f >= best[0]:
+                break
+            if index in closed:
+                continue
+            closed.add(index)
+
+            if index in finish and (best is None or g + finish[index][0] < best[0]):
+                best = (g + finish[index][0], index)
+
+            for (other, weight, e) in self.adjacency[index]:
+                if other in closed or (other in gvalue and gvalue[other] <= g + weight):
+                    continue
+                gvalue[other] = g + weight
+                parent[other] = (index, e)
+                heapq.heappush(heap, (g + weight + h(other), g + weight, seq, other))
+                seq += 1
+
+        if best is None:
+            raise ValueError(f"Could not find a connected path from {start} to {end}!")
+        if isinstance(best[1], list):
+            return best[1]
+
+        # Expand the node path back into cells: from the last node back to the start, edge by edge
+        index = best[1]
+        reverse = finish[index][1][::-1]
+        while parent[index][0] is not None:
+            (previous, e) = parent[index]
+            cells = self.edges[e].tolist()
+            if cells[-1] != self.nodes[index]:
+                cells.reverse()
+            reverse.extend(cells[-2::-1])
+            index = previous
+        reverse.extend(parent[index][1][-2::-1])
+        reverse.reverse()
+        return reverse
+
+    def distance(self, start: tuple, end: tuple) -> int:
+        '''
+        Length of the shortest path from @start to @end (number of moves), see path().
+        '''
+        return len(self.path(start, end)) - 1
@@ -1,8 +1,16 @@
 import numpy as np
 from PIL import Image
+from collections.abc import MutableMapping
 from amazed.modules.data_types import cells
 
 class Vector2D():
+    '''
+    Small vector of two integers: (x, y) = (row, column). Instances only hold two slots and hash as plain integers.\n
+    The four unit directions are interned: subtracting two adjacent positions returns the Maze.NORTH / EAST / SOUTH / WEST
+    object itself, so checking or looking up the direction of a move is cheap. Never assign to x or y.
+    '''
+    __slots__ = ("x", "y")
+
     def __init__(self, x_or_pair, y=None):
         if y is None:
             if isinstance(x_or_pair, tuple) and len(x_or_pair) == 2:
@@ -17,49 +25,68 @@ class Vector2D():
         return (self.x, self.y)
 
     def __add__(self, other):
-        new_x = self.x + other.x
-        new_y = self.y + other.y
-        return Vector2D(new_x, new_y)
+        return Vector2D(self.x + other.x, self.y + other.y)
     
     def __sub__(self, other):
         if isinstance(other, tuple):
-            new_x = self.x - other[0]
-            new_y = self.y - other[1]
+            (x, y) = (self.x - other[0], self.y - other[1])
         else:
-            new_x = self.x - other.x
-            new_y = self.y - other.y
-        return Vector2D(new_x, new_y)
+            (x, y) = (self.x - other.x, self.y - other.y)
+        return _UNITS.get((x, y)) or Vector2D(x, y)
     
     def __rsub__(self, other):
         if isinstance(other, tuple):
-            new_x = other[0] - self.x
-            new_y = other[1] - self.y
-
-            return Vector2D(new_x, new_y)
+            (x, y) = (other[0] - self.x, other[1] - self.y)
+            return _UNITS.get((x, y)) or Vector2D(x, y)
         else:
             raise TypeError("Unsupported operand types")
     
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, Vector2D):
             return self.x == other.x and self.y == other.y
         else:
             return False
     
     def __hash__(self):
-        return hash(hash(str(self.x)) + hash(str(self.y)))
+        return hash(self.x * 1000003 + self.y)
 
     def __str__(self):
         return f"({self.x}, {self.y})"
+
+# The interned unit directions, used as Maze.NORTH, Maze.EAST, Maze.SOUTH and Maze.WEST
+_UNITS = {(x, y): Vector2D(x, y) for (x, y) in [(-1, 0), (0, 1), (1, 0), (0, -1)]}
+
 class Maze:
     # Old values. IF SOMETHING DOESN'T WORK THAT IS NOT RELATED TO REINFORCEMENT LEARNING, IS BECAUSE OF THIS
     # NORTH = 1
     # EAST = 2
     # SOUTH = 3
     # WEST = 4
-    NORTH = Vector2D(-1, 0)
-    EAST = Vector2D(0, 1)
-    SOUTH = Vector2D(1, 0)
-    WEST = Vector2D(0, -1)
+    NORTH = _UNITS[(-1, 0)]
+    EAST = _UNITS[(0, 1)]
+    SOUTH = _UNITS[(1, 0)]
+    WEST = _UNITS[(0, -1)]
+
+    # Bit of each direction inside a 4-bit wall mask (a set bit marks the PRESENCE of a wall).
+    NORTH_BIT = 1
+    EAST_BIT = 2
+    SOUTH_BIT = 4
+    WEST_BIT = 8
+    ALL_WALLS = 15
+    BITS = {
+        NORTH : NORTH_BIT,
+        EAST : EAST_BIT,
+        SOUTH : SOUTH_BIT,
+        WEST : WEST_BIT
+    }
+
+    # Directions of an edge list (see carve_edges()): an edge (x, y, d) is the wall of cell (x, y) in direction DIRECTIONS[d].
+    # The opposite direction is d ^ 2.
+    DIRECTIONS = [NORTH, EAST, SOUTH, WEST]
+    DIRECTION_BITS = np.array([NORTH_BIT, EAST_BIT, SOUTH_BIT, WEST_BIT], dtype=np.uint8)
+    DIRECTION_OFFSETS = np.array([[-1, 0], [0, 1], [1, 0], [0, -1]])
 
     START_COLOR = (0, 255, 0)
     END_COLOR = (0, 255, 255)
@@ -114,6 +141,13 @@ class Maze:
         # Number of all walls (both external and internal)
         self.no_walls = rows * (columns - 1) + columns * (rows - 1) + (rows * 2 + columns * 2)
 
+        # Incremented by every change of the walls or cells, see invalidate()
+        self.revision = 0
+        self._neighbors = None
+        self._distances = None
+        self._junctions = None
+        self._clusters = None
+
     def reset(self):
         self.data.clear()
         for i in range(self.rows):
@@ -121,6 +155,82 @@ class Maze:
             for j in range(self.columns):
                 _.append(self.cell_type())
             self.data.append(_)
+        self.invalidate()
+
+    def invalidate(self):
+        '''
+        Drops everything cached about the walls and cells of the maze (e.g. neighbors()).\n
+        All methods of the maze call it (or patch the caches) by themselves. It only needs to be called after changing
+        cells directly, e.g. maze.data[x][y].active = False on a Maze or maze.walls[x, y] = ... on an ArrayMaze.
+        '''
+        self.revision += 1
+        self._neighbors = None
+
+    def neighbors(self) -> np.ndarray:
+        '''
+        Open-neighbor table: a (rows * columns, 4) int32 array where entry [x * columns + y, d] is the id
+        (x2 * columns + y2) of the neighbor of cell (x, y) in direction Maze.DIRECTIONS[d] if that move is possible
+        (no wall, both cells active), otherwise -1.\n
+        It is built on first use and kept up to date by path() and wall(). Do not modify it.
+        '''
+        if self._neighbors is None:
+            self._neighbors = neighbor_table(self.get_wall_mask(), self.get_active_mask())
+        return self._neighbors
+
+    def distances(self):
+        '''
+        The DistanceCache of this maze (see amazed.modules.solver), created on first use. It drops its
+        distance fields by itself when the maze changes.
+        '''
+        if self._distances is None:
+            from amazed.modules.solver import DistanceCache
+            self._distances = DistanceCache(self)
+        return self._distances
+
+    def junction_graph(self):
+        '''
+        The JunctionGraph of this maze (see amazed.modules.junctions), built on first use and again after the maze changed.
+        '''
+        if self._junctions is None or self._junctions.revision != self.revision:
+            from amazed.modules.junctions import JunctionGraph
+            self._junctions = JunctionGraph(self)
+        return self._junctions
+
+    def cluster_graph(self, size:int = 16):
+        '''
+        The ClusterGraph of this maze, with clusters of @size x @size cells (see amazed.modules.clusters). It is built on
+        first use, and again after the maze changed other than through path() and wall() (or for another @size).
+        '''
+        if self._clusters is None or self._clusters.revision != self.revision or self._clusters.size != size:
+            from amazed.modules.clusters import ClusterGraph
+            self._clusters = ClusterGraph(self, size)
+        return self._clusters
+
+    def open_neighbors(self, x:int, y:int) -> list:
+        '''
+        Cells reachable in one move from (@x, @y), as (x, y) tuples in the NORTH, EAST, SOUTH, WEST order.
+        '''
+        return [divmod(int(_), self.columns) for _ in self.neighbors()[x * self.columns + y] if _ != -1]
+
+    def _patch_neighbors(self, x, y, direction):
+        '''
+        Updates the neighbor table (if it was built) after the wall of (@x, @y) in @direction changed.
+        '''
+        self.revision += 1
+        if self._neighbors is None:
+            return
+
+        (x2, y2) = (x + direction.x, y + direction.y)
+        if 0 <= x2 < self.rows and 0 <= y2 < self.columns:
+            d = Maze.DIRECTIONS.index(direction)
+            (a, b) = (x * self.columns + y, x2 * self.columns + y2)
+            both = self.is_valid_position(x, y) and self.is_valid_position(x2, y2)
+            self._neighbors[a, d] = b if both and not self.is_wall(x, y, x2, y2) else -1
+            self._neighbors[b, d ^ 2] = a if both and not self.is_wall(x2, y2, x, y) else -1
+
+        # The cluster graph only needs the clusters around the wall again, if it was up to date
+        if self._clusters is not None and self._clusters.revision == self.revision - 1:
+            self._clusters.update(x, y, direction)
     
     def path(self, x, y, direction):
         '''
@@ -143,6 +253,7 @@ class Maze:
                 self.data[x][y-1].walls[Maze.EAST] = False
             self.data[x][y].walls[direction] = False
             self.no_walls -= 1
+            self._patch_neighbors(x, y, direction)
             return True
         except:
             return False
@@ -169,6 +280,7 @@ class Maze:
                 self.data[x][y-1].walls[Maze.EAST] = True
             self.data[x][y].walls[direction] = True
             self.no_walls += 1
+            self._patch_neighbors(x, y, direction)
             return True
         except:
             return False
@@ -200,6 +312,39 @@ class Maze:
         
         self.path(x1, y1, dir)
 
+    def carve_edges(self, xs, ys, directions, validate:bool=True) -> int:
+        '''
+        Bulk version of path(): for every k, destroyes the wall in direction Maze.DIRECTIONS[@directions[k]]
+        of cell (@xs[k], @ys[k]).\n
+        @validate: if set to True, all edges are checked in a single pass before anything is carved (see check_edges()).
+        Otherwise nothing is checked, so only use it for edges that are known to be valid.\n
+        Returns the number of edges carved.
+        '''
+        if validate:
+            check_edges(xs, ys, directions, self.get_active_mask())
+
+        for (x, y, d) in zip(xs, ys, directions):
+            direction = Maze.DIRECTIONS[d]
+            self.data[x][y].walls[direction] = False
+            self.data[x + direction.x][y + direction.y].walls[Maze.DIRECTIONS[d ^ 2]] = False
+        self.no_walls -= len(directions)
+        self.invalidate()
+        return len(directions)
+
+    def carve_pairs(self, x1, y1, x2, y2, validate:bool=True) -> int:
+        '''
+        Bulk version of path_to_cell(): for every k, destroyes the wall between the adjacent cells (@x1[k], @y1[k])
+        and (@x2[k], @y2[k]).\n
+        @validate: same as for carve_edges(). Both cells of every pair must be valid positions and adjacent.\n
+        Returns the number of edges carved.
+        '''
+        (x1, y1, x2, y2) = (np.asarray(_, dtype=np.intp) for _ in (x1, y1, x2, y2))
+        if validate:
+            check_edges(x1, y1, np.zeros(len(x1), dtype=np.intp), self.get_active_mask(), targets=(x2, y2))
+
+        directions = np.select([x2 < x1, y2 > y1, x2 > x1], [0, 1, 2], 3)
+        return self.carve_edges(x1, y1, directions, validate=False)
+
     def possible_actions(self, x:int , y:int) -> list:
         '''
         An action represents a valid move from the given cell.\n
@@ -210,15 +355,8 @@ class Maze:
         if not self.is_valid_position(x, y):
             raise ValueError(f'Incorrect values for x or/and y: ({x}, {y}). They must be between x \in [0, {self.rows}] and y \in [0, {self.columns}])\n')
         
-        possible_actions = []
-        if self.is_valid_position(x-1, y) and not self.is_wall(x, y, x-1, y):
-            possible_actions.append(Maze.NORTH)
-        if self.is_valid_position(x, y+1) and not self.is_wall(x, y, x, y+1):
-            possible_actions.append(Maze.EAST)
-        if self.is_valid_position(x+1, y) and not self.is_wall(x, y, x+1, y):
-            possible_actions.append(Maze.SOUTH)
-        if self.is_valid_position(x, y-1) and not self.is_wall(x, y, x, y-1):
-            possible_actions.append(Maze.WEST)
+        neighbors = self.neighbors()[x * self.columns + y]
+        possible_actions = [direction for (direction, neighbor) in zip(Maze.DIRECTIONS, neighbors) if neighbor != -1]
 
         return None if len(possible_actions) == 0 else possible_actions
 
@@ -268,7 +406,7 @@ class Maze:
             print(f"Not a valid end position: {x2}, {y2}")
             return False
         
-        if self.is_wall(x, y, x2, y2):
+        if x2 * self.columns + y2 not in self.neighbors()[x * self.columns + y]:
             print(f"There is a wall between {x}, {y} and {x2}, {y2}")
             return False
         
@@ -290,27 +428,34 @@ class Maze:
                     # Increment wall count if now a wall is present!
                     if self.data[i][j].walls[dir]:
                         self.no_walls += 1
+        self.invalidate()
 
+    def get_wall_mask(self) -> np.ndarray:
+        '''
+        Returns a (rows, columns) uint8 array with the walls of each cell encoded as a 4-bit mask
+        (see Maze.NORTH_BIT, Maze.EAST_BIT, Maze.SOUTH_BIT, Maze.WEST_BIT).\n
+        For a Maze this is a copy, modifying it does not change the maze.
+        '''
+        mask = np.zeros((self.rows, self.columns), dtype=np.uint8)
+        for i in range(self.rows):
+            for j in range(self.columns):
+                for dir, bit in Maze.BITS.items():
+                    if self.data[i][j].walls[dir]:
+                        mask[i][j] |= bit
+        return mask
+
+    def get_active_mask(self) -> np.ndarray:
+        '''
+        Returns a (rows, columns) boolean array marking the active cells.\n
+        For a Maze this is a copy, modifying it does not change the maze.
+        '''
+        return np.array([[cell.active for cell in row] for row in self.data], dtype=bool).reshape((self.rows, self.columns))
 
     def get_wall_bitstring(self):
         '''
         First map all vertical walls, then horizontal. Only internal walls are checked.
         '''
-        idv = []
-        for i in range(self.rows):
-            for j in range(self.columns - 1):
-                if self.data[i][j].walls[Maze.EAST]:
-                    idv.append("1")
-                else:
-                    idv.append("0")
-        
-        for i in range(self.rows - 1):
-            for j in range(self.columns):
-                if self.data[i][j].walls[Maze.SOUTH]:
-                    idv.append("1")
-                else:
-                    idv.append("0")
-        return idv
+        return np.where(self.get_wall_bits(), "1", "0").tolist()
 
     def set_wall_bitstring(self, idv: list | str):
         '''
@@ -319,99 +464,69 @@ class Maze:
         '''
         if (len(idv) == 0):
             return None
-        if isinstance(idv, str):
-            idv = [_ for _ in idv]
-        counter = 0
-        for i in range(self.rows):
-            for j in range(self.columns - 1):
-                if idv[counter] == "0":
-                    self.path(i, j, Maze.EAST)
-                counter += 1
-        for i in range(self.rows - 1):
-            for j in range(self.columns):
-                if idv[counter] == "0":
-                    self.path(i, j, Maze.SOUTH)
-                counter += 1
+        self.set_wall_bits(np.array([_ for _ in idv]) != "0")
+
+    def get_wall_bits(self, packed:bool=False) -> np.ndarray:
+        '''
+        Same as get_wall_bitstring(), but as a boolean array (True marks a wall).\n
+        @packed: if set to True, the bits are packed 8 per byte (np.packbits) into a uint8 array.
+        '''
+        bits = wall_bits(self.get_wall_mask())
+        return np.packbits(bits) if packed else bits
+
+    def set_wall_bits(self, bits:np.ndarray):
+        '''
+        Same as set_wall_bitstring(), but takes the result of get_wall_bits() (either packed or not).\n
+        The maze needs to be reseted first.
+        '''
+        bits = unpack_wall_bits(bits, self.rows, self.columns)
+        self.invalidate()
 
+        split = self.rows * (self.columns - 1)
+        for k in np.flatnonzero(~bits[:split]):
+            self.path(k // (self.columns - 1), k % (self.columns - 1), Maze.EAST)
+        for k in np.flatnonzero(~bits[split:]):
+            self.path(k // self.columns, k % self.columns, Maze.SOUTH)
+
+    def color_overlay(self) -> np.ma.MaskedArray:
+        '''
+        Returns an empty (rows, columns, 3) color overlay which can be passed as @cell_colors to export().\n
+        Assigning a color to a cell (overlay[row, column] = (red, green, blue)) unmasks it, all masked cells
+        keep their default color.
+        '''
+        return np.ma.masked_all((self.rows, self.columns, 3), dtype=np.uint8)
 
-    def export(self, distance:int=10, output:str=None, show:bool=True, cell_colors:dict=None, checkers:bool=True):
+    def export(self, distance:int=10, output:str=None, show:bool=True, cell_colors:dict | np.ndarray=None, checkers:bool=True, region:tuple=None):
         """
         Exports the maze to an image.
         @distance: the distance of each cell
         @output: path to file
         @show: display the final result
-        @cell_colors: a dict with the following format:\n
+        @cell_colors: either an overlay array of shape (rows, columns, 3) (see color_overlay()) or a dict with the following format:\n
                     {
                         "{row}, {column}" : (red, green, blue)
                     }
                     By default, all cells are colored with DEFAULT_COLOR.
         @checkers: default background color will change to a checkers pattern.
+        @region: optional (row_start, row_end, column_start, column_end) window (ends excluded). Only those cells are rendered,
+                 which keeps the export of very large (e.g. memory mapped) mazes small. The window is closed on its EAST and SOUTH sides.
         """
-        new_data = np.zeros((self.rows * distance + 1, self.columns * distance + 1, 3), dtype=np.uint8)
-
-        # Setting default values
-        if cell_colors is None:
-            cell_colors = {}
-
-        # cell_colors["0, 0"] = self.START_COLOR
-        # cell_colors[f"{self.rows-1}, {self.columns-1}"] = self.END_COLOR
-
+        (rows, columns) = (range(self.rows), range(self.columns))
+        if region is not None:
+            (rows, columns) = (rows[region[0]:region[1]], columns[region[2]:region[3]])
+        window = (slice(rows.start, rows.stop), slice(columns.start, columns.stop))
 
-        for i in range(self.rows):
-            for j in range(self.columns):
+        if isinstance(cell_colors, dict):
+            overlay = np.ma.masked_all((len(rows), len(columns), 3), dtype=np.uint8)
+            for key, color in cell_colors.items():
+                (i, j) = (int(_) for _ in key.split(","))
+                if i in rows and j in columns:
+                    overlay[i - rows.start, j - columns.start] = color
+            cell_colors = overlay
+        elif cell_colors is not None:
+            cell_colors = cell_colors[window]
 
-                for k1 in range(distance):
-                    for k2 in range(distance):
-                        key = f"{i}, {j}"
-                        if not self.data[i][j].active:
-                            new_data[i*distance+k1][j*distance+k2][0] = self.WALL_COLOR[0]
-                            new_data[i*distance+k1][j*distance+k2][1] = self.WALL_COLOR[1]
-                            new_data[i*distance+k1][j*distance+k2][2] = self.WALL_COLOR[2]
-                        elif key in cell_colors:
-                            new_data[i*distance+k1][j*distance+k2][0] = cell_colors[key][0]
-                            new_data[i*distance+k1][j*distance+k2][1] = cell_colors[key][1]
-                            new_data[i*distance+k1][j*distance+k2][2] = cell_colors[key][2]
-                        else:
-                            if checkers:
-                                if (i+j) % 2 == 0:
-                                    new_data[i*distance+k1][j*distance+k2][0] = self.CHECKERS_1[0]
-                                    new_data[i*distance+k1][j*distance+k2][1] = self.CHECKERS_1[1]
-                                    new_data[i*distance+k1][j*distance+k2][2] = self.CHECKERS_1[2]
-                                else:
-                                    new_data[i*distance+k1][j*distance+k2][0] = self.CHECKERS_2[0]
-                                    new_data[i*distance+k1][j*distance+k2][1] = self.CHECKERS_2[1]
-                                    new_data[i*distance+k1][j*distance+k2][2] = self.CHECKERS_2[2]
-                            else:
-                                # Just make them white
-                                new_data[i*distance+k1][j*distance+k2][0] = self.DEFAULT_COLOR[0]
-                                new_data[i*distance+k1][j*distance+k2][1] = self.DEFAULT_COLOR[1]
-                                new_data[i*distance+k1][j*distance+k2][2] = self.DEFAULT_COLOR[2]
-                
-                # West wall
-                # For east wall, it should be j*distance+(distance-1)
-                if self.data[i][j].walls[Maze.WEST]:
-                    for k in range(distance):
-                        new_data[i*distance+k][j*distance][0] = self.WALL_COLOR[0]
-                        new_data[i*distance+k][j*distance][1] = self.WALL_COLOR[1]
-                        new_data[i*distance+k][j*distance][2] = self.WALL_COLOR[2]
-                
-                # North wall
-                # For south wall, it should be i*distance+(distance-1)
-                if self.data[i][j].walls[Maze.NORTH]:
-                    for k in range(distance):
-                        new_data[i*distance][j*distance+k][0] = self.WALL_COLOR[0]
-                        new_data[i*distance][j*distance+k][1] = self.WALL_COLOR[1]
-                        new_data[i*distance][j*distance+k][2] = self.WALL_COLOR[2]
-        
-        # Add the EAST and SOUTH border
-        for i in range(self.rows):
-            new_data[i][-1][0] = self.WALL_COLOR[0]
-            new_data[i][-1][1] = self.WALL_COLOR[1]
-            new_data[i][-1][2] = self.WALL_COLOR[2]
-        for i in range(self.columns):
-            new_data[-1][i][0] = self.WALL_COLOR[0]
-            new_data[-1][i][1] = self.WALL_COLOR[1]
-            new_data[-1][i][2] = self.WALL_COLOR[2]
+        new_data = render(self.get_wall_mask()[window], self.get_active_mask()[window], distance, cell_colors, checkers)
 
         img = Image.fromarray(new_data)
         if output is not None and type(output) is str:
@@ -421,111 +536,132 @@ class Maze:
 
         return img
 
-    def graph(self, file='graph.txt'):
+    def csr(self) -> tuple:
+        '''
+        Returns the adjacency of the maze in CSR form, as a pair of int64 arrays (@indptr, @indices).\n
+        Cell (i, j) has the id i * columns + j and its neighbours (in ascending order) are
+        indices[indptr[id]:indptr[id+1]]. Two cells are neighbours if both are active and there is no wall between them.
+        '''
+        walls = self.get_wall_mask()
+        active = self.get_active_mask()
+        ids = np.arange(self.no_cells, dtype=np.int64).reshape((self.rows, self.columns))
+
+        # Ordered by id: NORTH, WEST, EAST, SOUTH
+        candidates = np.stack((ids - self.columns, ids - 1, ids + 1, ids + self.columns), axis=-1)
+        opened = np.stack([(walls & bit) == 0 for bit in (Maze.NORTH_BIT, Maze.WEST_BIT, Maze.EAST_BIT, Maze.SOUTH_BIT)], axis=-1)
+        opened[0, :, 0] = False
+        opened[:, 0, 1] = False
+        opened[:, -1, 2] = False
+        opened[-1, :, 3] = False
+
+        opened[:, :, 0][1:, :] &= active[:-1, :]
+        opened[:, :, 1][:, 1:] &= active[:, :-1]
+        opened[:, :, 2][:, :-1] &= active[:, 1:]
+        opened[:, :, 3][:-1, :] &= active[1:, :]
+        opened &= active[:, :, None]
+
+        opened = opened.reshape((self.no_cells, 4))
+        indptr = np.zeros(self.no_cells + 1, dtype=np.int64)
+        np.cumsum(opened.sum(axis=1), out=indptr[1:])
+        indices = candidates.reshape((self.no_cells, 4))[opened]
+
+        return indptr, indices
+
+    def graph(self, file='graph.npz'):
         '''
-        0s mark the presence of a wall.
-        1s mark a path between cell 'i' and cell 'j'.
+        Sparse adjacency of the maze (see csr()).
+        If @file is specified, the arrays are also saved to it using np.savez (load them back with Maze.load_graph()).
         The graph is undirected.
         A cell has no path to itself.
         '''
-        G = np.zeros((self.rows**2, self.columns**2), dtype=np.uint8)
-        
-        for i in range(self.rows):
-            for j in range(self.columns):
-                k1 = i * self.rows + j
-                if not self.data[i][j].walls[Maze.NORTH]:
-                    k2 = (i-1) * self.rows + j
-                    G[k1][k2] = 1
-                    G[k2][k1] = 1
-                if not self.data[i][j].walls[Maze.EAST]:
-                    k2 = i * self.rows + (j+1)
-                    G[k1][k2] = 1
-                    G[k2][k1] = 1
-                if not self.data[i][j].walls[Maze.SOUTH]:
-                    k2 = (i+1) * self.rows + j
-                    G[k1][k2] = 1
-                    G[k2][k1] = 1
-                if not self.data[i][j].walls[Maze.WEST]:
-                    k2 = i * self.rows + (j-1)
-                    G[k1][k2] = 1
-                    G[k2][k1] = 1
-        np.set_printoptions(threshold=np.inf, linewidth=G.size)
-        open(file, 'w').write(G.__str__())
-    
+        indptr, indices = self.csr()
+        if file is not None:
+            np.savez(file, indptr=indptr, indices=indices, shape=np.array([self.rows, self.columns]))
+        return indptr, indices
+
+    @staticmethod
+    def load_graph(file) -> tuple:
+        '''
+        Loads a graph saved by Maze.graph().\n
+        Returns (indptr, indices, (rows, columns)).
+        '''
+        with np.load(file) as graph:
+            (rows, columns) = graph['shape']
+            return graph['indptr'], graph['indices'], (int(rows), int(columns))
+
     def adjancency_list(self, file='list.txt'):
-        L = []
+        indptr, indices = self.csr()
 
-        for i in range(self.rows):
-            for j in range(self.columns):
-                L.append([])
-                k1 = i * self.rows + j
-                if not self.data[i][j].walls[Maze.NORTH]:
-                    k2 = (i-1) * self.rows + j
-                    L[k1].append(k2)
-                if not self.data[i][j].walls[Maze.EAST]:
-                    k2 = i * self.rows + (j+1)
-                    L[k1].append(k2)
-                if not self.data[i][j].walls[Maze.SOUTH]:
-                    k2 = (i+1) * self.rows + j
-                    L[k1].append(k2)
-                if not self.data[i][j].walls[Maze.WEST]:
-                    k2 = i * self.rows + (j-1)
-                    L[k1].append(k2)
         with open(file, 'w') as fout:
-            for line in L:
-                fout.write(f'{line}\n')
+            for k in range(self.no_cells):
+                fout.write(f'{indices[indptr[k]:indptr[k+1]].tolist()}\n')
 
     def array(self, file=None) -> np.ndarray:
         '''
         Encodes the current maze into a numerical integer matrix, with values between [0, 15].\n
         If @file is specified, the array will be written to a file instead of being returned.
         '''
-        arr = np.zeros((self.rows, self.columns))
-
-        for i in range(self.rows):
-            for j in range(self.columns):
+        arr = encode(self.get_wall_mask()).astype(np.float64)
 
-                index = ''
-                if self.data[i][j].walls[Maze.NORTH]:
-                    index += ' NORTH '
-                if self.data[i][j].walls[Maze.EAST]:
-                    index += ' EAST '
-                if self.data[i][j].walls[Maze.SOUTH]:
-                    index += ' SOUTH '
-                if self.data[i][j].walls[Maze.WEST]:
-                    index += ' WEST '
-                index = index.strip()
-                index = index.replace('  ', ' ')
-                
-                arr[i][j] = cells['types'][index]
-        
         if file is None:
-            # np.set_printoptions(threshold=np.inf, linewidth=np.inf)
-            # print(arr.flatten())
-            return arr.flatten()
+            return arr
         else:
             np.set_printoptions(threshold=np.inf, linewidth=self.columns * 10)
             with open(file, 'w') as fout:
-                fout.write(arr.__str__())
+                fout.write(arr.reshape((self.rows, self.columns)).__str__())
 
+    def save(self, file:str, seed=None, algorithm:str=None):
+        '''
+        Saves the maze into a compact, versioned binary file (see amazed.modules.mazefile): a short header followed by
+        one wall mask byte and one active byte per cell.\n
+        @seed, @algorithm: optional information about how the maze was generated, stored in the header.
+        '''
+        from amazed.modules import mazefile
+        mazefile.save(self, file, seed, algorithm)
+
+    @staticmethod
+    def load(file:str):
+        '''
+        Loads a maze saved with save() as an ArrayMaze. The file is read at once and the arrays of the maze are views
+        over that buffer (np.frombuffer), so nothing is parsed per cell.
+        '''
+        from amazed.modules import mazefile
+        (header, walls, active) = mazefile.load(file)
+        if header["count"] != 1:
+            raise ValueError(f"'{file}' holds {header['count']} mazes, use MazeBatch.load() instead.")
+        return ArrayMaze(header["rows"], header["columns"], walls=walls[0], active=active[0])
+
+    @staticmethod
+    def open(file:str, mode:str='r+'):
+        '''
+        Opens a maze file (see amazed.modules.mazefile) as an ArrayMaze backed by np.memmap, so only the parts of the maze
+        that are actually used get loaded into memory.\n
+        @mode: same as for np.memmap ("r", "r+" or "c").
+        '''
+        from amazed.modules import mazefile
+        return mazefile.open_maze(file, mode)
+
+    @staticmethod
     def build_from_array(arr : np.ndarray, rows : int, columns : int):
+        '''
+        Builds an ArrayMaze from an array encoded with Maze.array() (see decode()).
+        '''
         if rows * columns != arr.size:
             raise ValueError('The maze must have the number of rows and columns per total equal with the total number of elements in the array!')
-        
-        result = Maze(rows, columns)
-        arr = arr.reshape((rows, columns))
 
-        for i in range(rows):
-            for j in range(columns):
-                if 'NORTH' not in cells['types-numerical'][arr[i][j]]:
-                    result.path(i, j, Maze.NORTH)
-                if 'EAST' not in cells['types-numerical'][arr[i][j]]:
-                    result.path(i, j, Maze.EAST)
-                if 'SOUTH' not in cells['types-numerical'][arr[i][j]]:
-                    result.path(i, j, Maze.SOUTH)
-                if 'WEST' not in cells['types-numerical'][arr[i][j]]:
-                    result.path(i, j, Maze.WEST)
-        return result
+        return ArrayMaze(rows, columns, walls=decode(arr.reshape((rows, columns)), rows, columns))
+
+    @staticmethod
+    def build_from_arrays(arr : np.ndarray, rows : int, columns : int) -> list:
+        '''
+        Same as Maze.build_from_array(), but for a batch of encoded mazes of shape (N, rows * columns).\n
+        All mazes are decoded in one call and share the same (N, rows, columns) wall array.
+        '''
+        if arr.ndim != 2 or rows * columns != arr.shape[1]:
+            raise ValueError(f'Expected an array of shape (N, {rows * columns}), got {arr.shape}.')
+
+        walls = decode(arr, rows, columns)
+        return [ArrayMaze(rows, columns, walls=walls[k]) for k in range(len(walls))]
 
     def print(self):
         for i in range(self.rows):
@@ -568,3 +704,446 @@ class Maze:
                 break
         return output.__str__()
 
+
+
+# Lookup tables between the [0, 15] dataset encoding (data_types.cells) and 4-bit wall masks
+_NAME_BITS = {"NORTH": Maze.NORTH_BIT, "EAST": Maze.EAST_BIT, "SOUTH": Maze.SOUTH_BIT, "WEST": Maze.WEST_BIT}
+CODE_TO_MASK = np.array([sum(_NAME_BITS[name] for name in cells['types-numerical'][code].split()) for code in range(16)], dtype=np.uint8)
+MASK_TO_CODE = np.zeros(16, dtype=np.uint8)
+MASK_TO_CODE[CODE_TO_MASK] = np.arange(16, dtype=np.uint8)
+
+
+def encode(walls:np.ndarray) -> np.ndarray:
+    '''
+    Converts wall masks of shape (..., rows, columns) to the dataset encoding, flattened to (..., rows * columns).
+    '''
+    return MASK_TO_CODE[walls].reshape(walls.shape[:-2] + (-1,))
+
+
+def decode(codes:np.ndarray, rows:int, columns:int) -> np.ndarray:
+    '''
+    Converts dataset encoded mazes of shape (..., rows * columns) (or (..., rows, columns)) to wall masks of shape (..., rows, columns).\n
+    Values are rounded to the nearest integer, so raw (scaled) GAN outputs can be passed directly.
+    An internal wall is removed if any of the two cells it separates does not have it, the same way Maze.path() would.
+    '''
+    codes = np.rint(codes).astype(np.intp)
+    if codes.size > 0 and (codes.min() < 0 or codes.max() > 15):
+        raise ValueError(f'Encoded values must be between [0, 15], got values between [{codes.min()}, {codes.max()}].')
+
+    if codes.shape[-2:] != (rows, columns):
+        codes = codes.reshape(codes.shape[:-1] + (rows, columns))
+    walls = CODE_TO_MASK[codes]
+
+    east = ((walls[..., :, :-1] & Maze.EAST_BIT) == 0) | ((walls[..., :, 1:] & Maze.WEST_BIT) == 0)
+    walls[..., :, :-1][east] &= Maze.ALL_WALLS ^ Maze.EAST_BIT
+    walls[..., :, 1:][east] &= Maze.ALL_WALLS ^ Maze.WEST_BIT
+
+    south = ((walls[..., :-1, :] & Maze.SOUTH_BIT) == 0) | ((walls[..., 1:, :] & Maze.NORTH_BIT) == 0)
+    walls[..., :-1, :][south] &= Maze.ALL_WALLS ^ Maze.SOUTH_BIT
+    walls[..., 1:, :][south] &= Maze.ALL_WALLS ^ Maze.NORTH_BIT
+
+    return walls
+
+
+def wall_bits(walls:np.ndarray) -> np.ndarray:
+    '''
+    Internal walls of wall masks of shape (..., rows, columns), as a boolean array of shape (..., rows * (columns - 1) + (rows - 1) * columns).\n
+    Same layout as Maze.get_wall_bitstring(): first all vertical walls, then horizontal.
+    '''
+    batch = walls.shape[:-2]
+    vertical = (walls[..., :, :-1] & Maze.EAST_BIT) != 0
+    horizontal = (walls[..., :-1, :] & Maze.SOUTH_BIT) != 0
+    return np.concatenate((vertical.reshape(batch + (-1,)), horizontal.reshape(batch + (-1,))), axis=-1)
+
+
+def neighbor_table(walls:np.ndarray, active:np.ndarray) -> np.ndarray:
+    '''
+    Builds the open-neighbor table of a (rows, columns) maze, see Maze.neighbors().
+    A move is open when the cell has no wall in that direction and both cells are active.\n
+    A (count, rows, columns) batch gives a single (count * rows * columns, 4) table, the cells of the i-th maze
+    having the ids i * rows * columns + x * columns + y.
+    '''
+    ids = np.arange(walls.size, dtype=np.int32).reshape(walls.shape)
+    table = np.full(walls.shape + (4,), -1, dtype=np.int32)
+
+    # For each direction: the cells that have a neighbor there, and those neighbors
+    cells = [(slice(1, None), slice(None)), (slice(None), slice(None, -1)), (slice(None, -1), slice(None)), (slice(None), slice(1, None))]
+    targets = [(slice(None, -1), slice(None)), (slice(None), slice(1, None)), (slice(1, None), slice(None)), (slice(None), slice(None, -1))]
+    for (d, (cell, target)) in enumerate(zip(cells, targets)):
+        (cell, target) = ((Ellipsis,) + cell, (Ellipsis,) + target)
+        opened = ((walls[cell] & Maze.DIRECTION_BITS[d]) == 0) & active[cell] & active[target]
+        table[cell + (d,)] = np.where(opened, ids[target], -1)
+    return table.reshape((walls.size, 4))
+
+
+def unpack_wall_bits(bits:np.ndarray, rows:int, columns:int) -> np.ndarray:
+    '''
+    Returns @bits as a boolean array of shape (..., rows * (columns - 1) + (rows - 1) * columns).\n
+    Boolean arrays are returned as they are, uint8 arrays are considered packed (see Maze.get_wall_bits()).
+    '''
+    bits = np.asarray(bits)
+    if bits.dtype == bool:
+        return bits
+    if bits.dtype != np.uint8:
+        raise TypeError(f'Expected a boolean or a packed uint8 array, got {bits.dtype}.')
+    length = rows * (columns - 1) + (rows - 1) * columns
+    return np.unpackbits(bits, axis=-1, count=length).view(bool)
+
+
+def carve_wall_bits(walls:np.ndarray, bits:np.ndarray) -> int:
+    '''
+    Opposite of wall_bits(): removes (in-place) every internal wall whose bit is False, the same way
+    Maze.set_wall_bitstring() does. Walls whose bit is True are left untouched.\n
+    Returns the number of walls that were carved.
+    '''
+    (rows, columns) = walls.shape[-2:]
+    batch = walls.shape[:-2]
+    split = rows * (columns - 1)
+    east = ~bits[..., :split].reshape(batch + (rows, columns - 1))
+    south = ~bits[..., split:].reshape(batch + (rows - 1, columns))
+
+    # Masks of the bits to clear, applied to whole slices (much faster than boolean indexing on large mazes)
+    walls[..., :, :-1] &= ~(east * np.uint8(Maze.EAST_BIT))
+    walls[..., :, 1:] &= ~(east * np.uint8(Maze.WEST_BIT))
+    walls[..., :-1, :] &= ~(south * np.uint8(Maze.SOUTH_BIT))
+    walls[..., 1:, :] &= ~(south * np.uint8(Maze.NORTH_BIT))
+    return int(np.count_nonzero(east) + np.count_nonzero(south))
+
+
+def check_edges(xs, ys, directions, active:np.ndarray, targets:tuple=None):
+    '''
+    Validates an edge list (see Maze.carve_edges()) in a single vectorized pass: every (@xs[k], @ys[k]) must be
+    an active cell of @active, every direction must be in [0, 4) and every neighbour must be inside the maze.\n
+    @targets: optional pair of arrays (x2, y2) with the neighbours given explicitly (see Maze.carve_pairs()).
+    In that case @directions is ignored, the neighbours must be adjacent and active.\n
+    Raises ValueError for the first invalid edge.
+    '''
+    (rows, columns) = active.shape
+    (xs, ys, directions) = (np.asarray(_, dtype=np.intp) for _ in (xs, ys, directions))
+
+    def inside(x, y):
+        return (x >= 0) & (y >= 0) & (x < rows) & (y < columns)
+
+    valid = inside(xs, ys)
+    valid[valid] = active[xs[valid], ys[valid]]
+    if targets is None:
+        valid &= (directions >= 0) & (directions < 4)
+        (dx, dy) = Maze.DIRECTION_OFFSETS[np.where(valid, directions, 0)].T
+        valid &= inside(xs + dx, ys + dy)
+    else:
+        (x2, y2) = (np.asarray(_, dtype=np.intp) for _ in targets)
+        valid &= inside(x2, y2) & (np.abs(xs - x2) + np.abs(ys - y2) == 1)
+        valid[valid] = active[x2[valid], y2[valid]]
+
+    if not valid.all():
+        k = np.flatnonzero(~valid)[0]
+        edge = (xs[k], ys[k], directions[k]) if targets is None else (xs[k], ys[k], x2[k], y2[k])
+        raise ValueError(f'Invalid edge at index {k}: {tuple(int(_) for _ in edge)}. Cells must be active, adjacent and inside the maze ({rows}, {columns}).\n')
+
+
+def render(walls:np.ndarray, active:np.ndarray, distance:int=10, cell_colors:np.ndarray=None, checkers:bool=True) -> np.ndarray:
+    '''
+    Renders wall masks (see Maze.get_wall_mask()) into RGB pixels, the same way Maze.export() does.\n
+    @walls and @active can have any number of leading (batch) dimensions: (..., rows, columns).
+    @cell_colors: optional (..., rows, columns, 3) overlay. If it is a masked array, only the unmasked cells are colored.
+    Returns a uint8 array of shape (..., rows * distance + 1, columns * distance + 1, 3).
+    '''
+    (rows, columns) = walls.shape[-2:]
+    batch = walls.shape[:-2]
+
+    # Background of each cell, as an index in the palette
+    palette = np.array([Maze.WALL_COLOR, Maze.CHECKERS_1, Maze.CHECKERS_2, Maze.DEFAULT_COLOR], dtype=np.uint8)
+    if checkers:
+        (i, j) = np.indices((rows, columns))
+        index = np.broadcast_to(1 + (i + j) % 2, walls.shape).copy()
+    else:
+        index = np.full(walls.shape, 3)
+    index[~active] = 0
+    colors = palette[index]
+
+    if cell_colors is not None:
+        colored = ~np.ma.getmaskarray(cell_colors).any(axis=-1) & active
+        colors[colored] = np.ma.getdata(cell_colors)[colored]
+
+    # Stretch every cell to distance x distance pixels, then stamp the WEST and NORTH walls on its first column and row
+    body = np.broadcast_to(colors[..., :, None, :, None, :], batch + (rows, distance, columns, distance, 3)).copy()
+
+    first_column = body[..., 0, :]
+    first_column[np.broadcast_to(((walls & Maze.WEST_BIT) != 0)[..., :, None, :], first_column.shape[:-1])] = Maze.WALL_COLOR
+    first_row = body[..., 0, :, :, :]
+    first_row[np.broadcast_to(((walls & Maze.NORTH_BIT) != 0)[..., :, :, None], first_row.shape[:-1])] = Maze.WALL_COLOR
+
+    new_data = np.empty(batch + (rows * distance + 1, columns * distance + 1, 3), dtype=np.uint8)
+    new_data[..., :-1, :-1, :] = body.reshape(batch + (rows * distance, columns * distance, 3))
+
+    # Add the EAST and SOUTH border
+    new_data[..., -1, :, :] = Maze.WALL_COLOR
+    new_data[..., :, -1, :] = Maze.WALL_COLOR
+
+    return new_data
+
+
+class ArrayMaze(Maze):
+    '''
+    Maze that stores all of its walls in a single (rows, columns) uint8 array of 4-bit masks
+    (@walls, see Maze.NORTH_BIT etc.) and the cell states in a boolean array (@active).\n
+    It offers the same API as Maze. @data is only a compatibility shim: it is built on first access
+    and its cells read and write straight into the two arrays.
+    '''
+
+    # direction : (row offset, column offset, own bit, neighbour bit)
+    MOVES = {
+        Maze.NORTH : (-1, 0, Maze.NORTH_BIT, Maze.SOUTH_BIT),
+        Maze.EAST : (0, 1, Maze.EAST_BIT, Maze.WEST_BIT),
+        Maze.SOUTH : (1, 0, Maze.SOUTH_BIT, Maze.NORTH_BIT),
+        Maze.WEST : (0, -1, Maze.WEST_BIT, Maze.EAST_BIT)
+    }
+
+    # Number of walls for each of the 16 possible masks
+    WALL_COUNT = np.array([bin(mask).count("1") for mask in range(16)], dtype=np.int64)
+
+    class CellWalls(MutableMapping):
+        '''
+        Dict-like view over the walls of a single cell, keyed by direction.
+        '''
+        def __init__(self, maze, x, y):
+            self.maze = maze
+            self.x = x
+            self.y = y
+
+        def __getitem__(self, direction):
+            return bool(self.maze.walls[self.x, self.y] & Maze.BITS[direction])
+
+        def __setitem__(self, direction, value):
+            if value:
+                self.maze.walls[self.x, self.y] |= Maze.BITS[direction]
+            else:
+                self.maze.walls[self.x, self.y] &= Maze.ALL_WALLS ^ Maze.BITS[direction]
+            self.maze.invalidate()
+
+        def __delitem__(self, direction):
+            raise TypeError("Walls of a cell cannot be deleted.")
+
+        def __iter__(self):
+            return iter(Maze.BITS)
+
+        def __len__(self):
+            return len(Maze.BITS)
+
+    class CellView(Maze.Cell):
+        '''
+        Cell backed by the arrays of an ArrayMaze.\n
+        While the cell is being constructed (no maze attached yet) writes to @walls and @active are ignored,
+        so constructors inheriting Maze.Cell (e.g. GameCell) only set their own attributes.
+        '''
+        maze = None
+
+        @property
+        def walls(self):
+            return ArrayMaze.CellWalls(self.maze, self.x, self.y)
+
+        @walls.setter
+        def walls(self, value):
+            if self.maze is None:
+                return
+            mask = 0
+            for dir, bit in Maze.BITS.items():
+                if value[dir]:
+                    mask |= bit
+            self.maze.walls[self.x, self.y] = mask
+            self.maze.invalidate()
+
+        @property
+        def active(self):
+            return bool(self.maze.active[self.x, self.y])
+
+        @active.setter
+        def active(self, value):
+            if self.maze is None:
+                return
+            self.maze.active[self.x, self.y] = value
+            self.maze.invalidate()
+
+    def __init__(self, rows:int=4, columns:int=4, constructor:Maze.Cell=Maze.Cell, walls:np.ndarray=None, active:np.ndarray=None):
+        '''
+        Constructs a maze according to the number of rows/columns provided, with all walls present.\n
+        @walls, @active: optional (rows, columns) arrays to use as storage instead of new ones (they are not copied).
+        '''
+        self.rows = rows
+        self.columns = columns
+        self.cell_type = constructor
+        self.no_cells = rows * columns
+
+        self.walls = np.full((rows, columns), Maze.ALL_WALLS, dtype=np.uint8) if walls is None else walls
+        self.active = np.ones((rows, columns), dtype=bool) if active is None else active
+        if self.walls.shape != (rows, columns) or self.walls.dtype != np.uint8:
+            raise ValueError(f'Expected a uint8 wall array of shape {(rows, columns)}, got {self.walls.dtype} {self.walls.shape}.')
+        if self.active.shape != (rows, columns) or self.active.dtype != bool:
+            raise ValueError(f'Expected a boolean active array of shape {(rows, columns)}, got {self.active.dtype} {self.active.shape}.')
+
+        # Number of all walls (both external and internal)
+        self.no_walls = ArrayMaze.count_walls(self.walls)
+
+        # Incremented by every change of the walls or cells, see invalidate()
+        self.revision = 0
+        self._neighbors = None
+        self._distances = None
+        self._junctions = None
+        self._clusters = None
+
+        if constructor is Maze.Cell:
+            self._view_type = ArrayMaze.CellView
+        else:
+            self._view_type = type(f"{constructor.__name__}View", (ArrayMaze.CellView, constructor), {})
+        self._data = None
+
+    @property
+    def data(self):
+        '''
+        List of lists of cell views, created on first access.
+        '''
+        if self._data is None:
+            self._data = [[self._cell_view(i, j) for j in range(self.columns)] for i in range(self.rows)]
+        return self._data
+
+    def _cell_view(self, x, y):
+        cell = self._view_type.__new__(self._view_type)
+        cell.__init__()
+        cell.x = x
+        cell.y = y
+        cell.maze = self
+        return cell
+
+    def reset(self):
+        self.walls.fill(Maze.ALL_WALLS)
+        self.active.fill(True)
+
+        # Cell views are recreated, so the extra attributes of the constructor start over as well
+        self._data = None
+        self.invalidate()
+
+    def path(self, x, y, direction):
+        '''
+        Destroyes the wall in direction @direction corresponding to cell at positions @x, @y.\n
+        Returns @True on success, @False on failure (the neighbour is outside of the maze).
+        '''
+        if direction not in ArrayMaze.MOVES:
+            raise ValueError(f'Incorrect value provided for direction: {direction}\n')
+        if not self.is_valid_position(x, y):
+            raise ValueError(f'Incorrect values for x or/and y: ({x}, {y}). They must be between [0, {self.rows}])\n')
+
+        (dx, dy, bit, neighbour_bit) = ArrayMaze.MOVES[direction]
+        if not (0 <= x + dx < self.rows and 0 <= y + dy < self.columns):
+            return False
+
+        self.walls[x + dx, y + dy] &= Maze.ALL_WALLS ^ neighbour_bit
+        self.walls[x, y] &= Maze.ALL_WALLS ^ bit
+        self.no_walls -= 1
+        self._patch_neighbors(x, y, direction)
+        return True
+
+    def carve_edges(self, xs, ys, directions, validate:bool=True) -> int:
+        '''
+        Bulk version of path(), see Maze.carve_edges(). All edges are carved at once, straight into @walls.
+        '''
+        (xs, ys, directions) = (np.asarray(_, dtype=np.intp) for _ in (xs, ys, directions))
+        if validate:
+            check_edges(xs, ys, directions, self.active)
+
+        # bitwise_and.at, so that multiple edges of the same cell are all applied
+        (dx, dy) = Maze.DIRECTION_OFFSETS[directions].T
+        np.bitwise_and.at(self.walls, (xs, ys), Maze.ALL_WALLS ^ Maze.DIRECTION_BITS[directions])
+        np.bitwise_and.at(self.walls, (xs + dx, ys + dy), Maze.ALL_WALLS ^ Maze.DIRECTION_BITS[directions ^ 2])
+        self.no_walls -= len(directions)
+        self.invalidate()
+        return len(directions)
+
+    def wall(self, x, y, direction):
+        '''
+        Similar to self.path()
+        Add the wall in direction @direction corresponding to cell at positions @x, @y.\n
+        Returns @True on success, @False on failure (the neighbour is outside of the maze).
+        '''
+        if direction not in ArrayMaze.MOVES:
+            raise ValueError(f'[wall] Incorrect value provided for direction: {direction}\n')
+        if not self.is_valid_position(x, y):
+            raise ValueError(f'[wall] Incorrect values for x or/and y: ({x}, {y}). They must be between [0, {self.rows}])\n')
+
+        (dx, dy, bit, neighbour_bit) = ArrayMaze.MOVES[direction]
+        if not (0 <= x + dx < self.rows and 0 <= y + dy < self.columns):
+            return False
+
+        self.walls[x + dx, y + dy] |= neighbour_bit
+        self.walls[x, y] |= bit
+        self.no_walls += 1
+        self._patch_neighbors(x, y, direction)
+        return True
+
+    def is_valid_position(self, x, y):
+        return 0 <= x < self.rows and 0 <= y < self.columns and bool(self.active[x, y])
+
+    def is_wall(self, x1, y1, x2, y2):
+        '''
+        Is there a wall between cell [@x1][@y1] and [@x2][@y2]?
+        '''
+        if abs(x1-x2) != 1 and abs(y1-y2) != 1:
+            raise ValueError(f'Incorrect values provided! Cells need to be adjacent and different: ({x1}, {y1}), ({x2}, {y2})')
+
+        if not self.is_valid_position(x1, y1):
+            raise ValueError(f'Incorrect values for x or/and y: ({x1}, {y1}). They must be between x \\in [0, {self.rows}] and y \\in [0, {self.columns}])\n')
+
+        if not self.is_valid_position(x2, y2):
+            raise ValueError(f'Incorrect values for x or/and y: ({x2}, {y2}). They must be between x \\in [0, {self.rows}] and y \\in [0, {self.columns}])\n')
+
+        if x1 < x2:
+            bit = Maze.SOUTH_BIT
+        elif x1 > x2:
+            bit = Maze.NORTH_BIT
+        elif y1 < y2:
+            bit = Maze.EAST_BIT
+        else:
+            bit = Maze.WEST_BIT
+
+        return bool(self.walls[x1, y1] & bit)
+
+    def toggle(self):
+        '''
+        Toggles all walls for the current Maze object. \n
+        Example: given a cell with walls on the North and South side, after this operation
+        it will have walls on the East and West side.
+        '''
+        self.walls ^= Maze.ALL_WALLS
+        self.no_walls = int(ArrayMaze.WALL_COUNT[self.walls].sum())
+        self.invalidate()
+
+    @staticmethod
+    def count_walls(walls:np.ndarray) -> int:
+        '''
+        Number of walls (both external and internal) in a (rows, columns) wall array, each wall counted once.
+        '''
+        internal = np.count_nonzero(walls[:, :-1] & Maze.EAST_BIT) + np.count_nonzero(walls[:-1, :] & Maze.SOUTH_BIT)
+        external = np.count_nonzero(walls[0, :] & Maze.NORTH_BIT) + np.count_nonzero(walls[-1, :] & Maze.SOUTH_BIT) + \
+            np.count_nonzero(walls[:, 0] & Maze.WEST_BIT) + np.count_nonzero(walls[:, -1] & Maze.EAST_BIT)
+        return int(internal + external)
+
+    def get_wall_mask(self) -> np.ndarray:
+        '''
+        Returns the (rows, columns) uint8 array holding the walls of this maze.\n
+        This is the storage itself, not a copy.
+        '''
+        return self.walls
+
+    def get_active_mask(self) -> np.ndarray:
+        '''
+        Returns the (rows, columns) boolean array holding the active cells of this maze.\n
+        This is the storage itself, not a copy.
+        '''
+        return self.active
+
+    def set_wall_bits(self, bits:np.ndarray):
+        '''
+        Same as set_wall_bitstring(), but takes the result of get_wall_bits() (either packed or not).\n
+        The maze needs to be reseted first.
+        '''
+        self.no_walls -= carve_wall_bits(self.walls, unpack_wall_bits(bits, self.rows, self.columns))
+        self.invalidate()
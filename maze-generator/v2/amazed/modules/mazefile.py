@@ -0,0 +1,210 @@
+import json
+import numpy as np
+
+from amazed.modules.maze import Maze, ArrayMaze
+from amazed.modules.batch import MazeBatch
+
+# File layout (all sizes in bytes):
+#   MAGIC (8) | version (uint16, little endian) | header length (uint32, little endian) | JSON header (padded with spaces)
+#   walls payload: count * rows * columns uint8 wall masks (see Maze.get_wall_mask()), row-major
+#   active payload: count * rows * columns booleans (see Maze.get_active_mask()), row-major
+# The payloads start at a multiple of ALIGNMENT, so they can be mapped straight into memory.
+MAGIC = b"\x93AMAZED\n"
+VERSION = 1
+ALIGNMENT = 64
+HEADER_SIZE = 256
+PREFIX_SIZE = len(MAGIC) + 2 + 4
+ENCODINGS = ["mask"]
+
+
+def _pack_header(header:dict, size:int=HEADER_SIZE) -> bytes:
+    '''
+    Serializes @header into at least @size bytes (rounded up to ALIGNMENT), padding the JSON with spaces.
+    '''
+    text = json.dumps(header).encode("ascii")
+    size = max(size, -(-(PREFIX_SIZE + len(text) + 1) // ALIGNMENT) * ALIGNMENT)
+    text = text.ljust(size - PREFIX_SIZE - 1) + b"\n"
+    return MAGIC + np.uint16(VERSION).tobytes() + np.uint32(len(text)).tobytes() + text
+
+
+def parse_header(data:bytes, file:str="<bytes>") -> dict:
+    '''
+    Parses the header at the start of @data (the whole file or at least its first bytes).
+    Returns a dict with the keys "version", "count", "rows", "columns", "encoding", "seed", "algorithm"
+    and "offset" (where the walls payload starts).
+    '''
+    if len(data) < PREFIX_SIZE or bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"'{file}' is not a maze file.")
+    version = int(np.frombuffer(data, dtype="<u2", count=1, offset=len(MAGIC))[0])
+    length = int(np.frombuffer(data, dtype="<u4", count=1, offset=len(MAGIC) + 2)[0])
+    if version > VERSION:
+        raise ValueError(f"'{file}' uses version {version} of the maze file format, only versions up to {VERSION} are supported.")
+    if len(data) < PREFIX_SIZE + length:
+        raise ValueError(f"The header of '{file}' is truncated.")
+
+    header = json.loads(bytes(data[PREFIX_SIZE:PREFIX_SIZE + length]).decode("ascii"))
+    if header["encoding"] not in ENCODINGS:
+        raise ValueError(f"'{file}' uses an unknown encoding: {header['encoding']}.")
+    header["version"] = version
+    header["offset"] = PREFIX_SIZE + length
+    return header
+
+
+def read_header(file:str) -> dict:
+    '''
+    Reads the header of a maze file, see parse_header().
+    '''
+    with open(file, "rb") as f:
+        data = f.read(PREFIX_SIZE)
+        if len(data) == PREFIX_SIZE:
+            data += f.read(int(np.frombuffer(data, dtype="<u4", count=1, offset=len(MAGIC) + 2)[0]))
+    return parse_header(data, file)
+
+
+def update_header(file:str, **fields):
+    '''
+    Changes some header @fields (e.g. seed=..., algorithm=...) of an existing maze file, in place.\n
+    Shape and encoding cannot be changed this way. Raises ValueError if the new header does not fit in the old one.
+    '''
+    header = read_header(file)
+    for key in fields:
+        if key not in ["seed", "algorithm"]:
+            raise ValueError(f"Cannot update the '{key}' field of a maze file.")
+    header.update(fields)
+
+    offset = header.pop("offset")
+    header.pop("version")
+    data = _pack_header(header, offset)
+    if len(data) != offset:
+        raise ValueError(f"The new header of '{file}' needs {len(data)} bytes, but only {offset} are available.")
+    with open(file, "r+b") as f:
+        f.write(data)
+
+
+def memmap(file:str, mode:str="r+") -> tuple:
+    '''
+    Maps the payloads of a maze file into memory, nothing is read until it is used.\n
+    @mode: same as for np.memmap ("r", "r+" or "c").\n
+    Returns (header, walls, active), with walls and active of shape (count, rows, columns).
+    '''
+    header = read_header(file)
+    shape = (header["count"], header["rows"], header["columns"])
+    size = shape[0] * shape[1] * shape[2]
+
+    walls = np.memmap(file, dtype=np.uint8, mode=mode, offset=header["offset"], shape=shape)
+    active = np.memmap(file, dtype=bool, mode=mode, offset=header["offset"] + size, shape=shape)
+    return (header, walls, active)
+
+
+def create(file:str, rows:int, columns:int, count:int=1, seed=None, algorithm:str=None) -> MazeBatch:
+    '''
+    Creates a maze file holding @count mazes with all walls present and maps it into memory.\n
+    The file is created sparse and filled page by page, so it can be much larger than the available RAM.
+    @seed, @algorithm: only stored in the header (see update_header()).\n
+    Returns a MazeBatch backed by the file. Use open_maze() to get a single ArrayMaze instead.
+    '''
+    header = {"count": count, "rows": rows, "columns": columns, "encoding": "mask", "seed": seed, "algorithm": algorithm}
+    data = _pack_header(header)
+    with open(file, "wb") as f:
+        f.write(data)
+        f.truncate(len(data) + 2 * count * rows * columns)
+
+    batch = open_batch(file)
+    batch.reset()
+    return batch
+
+
+def open_batch(file:str, mode:str="r+") -> MazeBatch:
+    '''
+    Opens a maze file as a MazeBatch whose walls and active arrays are memory maps (see memmap()).\n
+    Changes are written back to the file (unless @mode is "r" or "c"), call flush() to force it.
+    '''
+    (header, walls, active) = memmap(file, mode)
+    return MazeBatch(header["count"], header["rows"], header["columns"], walls, active)
+
+
+def open_maze(file:str, mode:str="r+", index:int=0) -> ArrayMaze:
+    '''
+    Opens the maze at @index of a maze file as an ArrayMaze backed by memory maps, see open_batch().\n
+    Any Sculptor, solver or exporter can work on it directly.
+    '''
+    return open_batch(file, mode)[index]
+
+
+def flush(maze:ArrayMaze | MazeBatch):
+    '''
+    Writes the changes of a memory mapped maze (or batch) back to its file.
+    '''
+    for array in (maze.walls, maze.active):
+        base = array
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        if base is None:
+            raise ValueError("The maze is not backed by a maze file.")
+        base.flush()
+
+
+def generate(file:str, rows:int, columns:int, sculptor:type, seed=None, **kwargs) -> ArrayMaze:
+    '''
+    Creates a maze file and carves it with @sculptor (a Sculptor subclass, e.g. DepthFirstSearch) straight into
+    the memory map. The seed and the name of the algorithm are stored in the header.\n
+    @kwargs: forwarded to the sculptor.
+    '''
+    create(file, rows, columns)
+    maze = open_maze(file)
+    sculptor = sculptor(maze, seed=seed, **kwargs)
+    flush(maze)
+    update_header(file, seed=sculptor.seed, algorithm=type(sculptor).__name__)
+    return maze
+
+
+def dumps(walls:np.ndarray, active:np.ndarray, seed=None, algorithm:str=None) -> bytes:
+    '''
+    Serializes (count, rows, columns) or (rows, columns) @walls and @active arrays into the maze file format.
+    '''
+    if walls.ndim == 2:
+        (walls, active) = (walls[None], active[None])
+    (count, rows, columns) = walls.shape
+    header = {"count": count, "rows": rows, "columns": columns, "encoding": "mask", "seed": seed, "algorithm": algorithm}
+    return _pack_header(header) + np.ascontiguousarray(walls, dtype=np.uint8).tobytes() + np.ascontiguousarray(active, dtype=bool).tobytes()
+
+
+def loads(data:bytes, file:str="<bytes>") -> tuple:
+    '''
+    Opposite of dumps(). The payloads are not parsed nor copied: walls and active are np.frombuffer() views over @data
+    (read-only if @data is immutable, e.g. bytes).\n
+    Returns (header, walls, active), with walls and active of shape (count, rows, columns).
+    '''
+    header = parse_header(data, file)
+    shape = (header["count"], header["rows"], header["columns"])
+    size = shape[0] * shape[1] * shape[2]
+    if len(data) < header["offset"] + 2 * size:
+        raise ValueError(f"'{file}' is truncated: expected {header['offset'] + 2 * size} bytes, got {len(data)}.")
+
+    walls = np.frombuffer(data, dtype=np.uint8, count=size, offset=header["offset"]).reshape(shape)
+    active = np.frombuffer(data, dtype=bool, count=size, offset=header["offset"] + size).reshape(shape)
+    return (header, walls, active)
+
+
+def save(maze:Maze | MazeBatch, file:str, seed=None, algorithm:str=None):
+    '''
+    Writes a maze (any Maze subclass) or a MazeBatch to @file, see Maze.save().
+    '''
+    if isinstance(maze, MazeBatch):
+        data = dumps(maze.walls, maze.active, seed, algorithm)
+    else:
+        data = dumps(maze.get_wall_mask(), maze.get_active_mask(), seed, algorithm)
+    with open(file, "wb") as f:
+        f.write(data)
+
+
+def load(file:str) -> tuple:
+    '''
+    Reads a whole maze file into a single (writable) buffer and returns loads() of it.
+    '''
+    with open(file, "rb") as f:
+        f.seek(0, 2)
+        data = bytearray(f.tell())
+        f.seek(0)
+        f.readinto(data)
+    return loads(data, file)
@@ -1,7 +1,9 @@
 from amazed.modules.maze import Maze
 
+import heapq
+from collections import OrderedDict
 import numpy as np
-from random import shuffle
+import random
 from PIL import ImageDraw
 
 # from keras.models import Sequential
@@ -31,45 +33,155 @@ def standard_minkowski(start, end, p=3):
     (endx, endy) = end
     return (abs(x-endx)**p + abs(y-endy)**p) ** (1/p)
 
-def flood_fill(maze : Maze) -> int:
+def bfs_distances(neighbors : np.ndarray, sources) -> np.ndarray:
     '''
-    It is not indended to be used as a unique solver between START and FINISH.\n
-    It counts the total number of separate areas in a maze.
+    Level-synchronous breadth-first search over an open-neighbor table (see Maze.neighbors() and neighbor_table()):
+    the whole frontier (an array of cell ids) is expanded at once, and each cell is marked as soon as it is reached.\n
+    @sources: the cell ids the search starts from (e.g. one per maze of a batch).\n
+    Returns a flat int array holding the number of moves from the closest source to each cell, or -1 if no source reaches it.
+    '''
+    size = len(neighbors)
+
+    # The extra last entry is what the -1 entries of the table point to; it counts as already visited.
+    distance = np.full(size + 1, -1)
+    distance[size] = 0
+    owner = np.zeros(size + 1, dtype=np.int64)
+
+    frontier = np.asarray(sources).ravel()
+    distance[frontier] = 0
+    level = 0
+    while frontier.size != 0:
+        level += 1
+        frontier = neighbors[frontier].ravel()
+        frontier = frontier[distance[frontier] == -1]
+        distance[frontier] = level
+
+        # A cell reached from two frontier cells is kept once
+        if frontier.size > 1:
+            order = np.arange(frontier.size)
+            owner[frontier] = order
+            frontier = frontier[owner[frontier] == order]
+
+    return distance[:size]
+
+def distance_field(maze : Maze, start : tuple) -> np.ndarray:
     '''
+    Distance (number of moves) from @start to every cell of the maze, see bfs_distances().\n
+    Returns a (rows, columns) int array, with -1 for the cells that cannot be reached.
+    '''
+    return bfs_distances(maze.neighbors(), [start[0] * maze.columns + start[1]]).reshape((maze.rows, maze.columns))
 
-    # Mark all cells as unvisited with -1.
-    array = np.full((maze.rows, maze.columns), -1)
+def component_labels(maze : Maze) -> np.ndarray:
+    '''
+    Labels the separate areas of a maze (cells reachable from one another get the same label), with one
+    level-synchronous search (see bfs_distances()) per area.\n
+    Returns a (rows, columns) int array with labels from 1 to the number of areas, numbered in the order
+    in which the areas are first met when going through the cells row by row.
+    '''
+    neighbors = maze.neighbors()
+    size = len(neighbors)
+
+    # Same sentinel as in bfs_distances()
+    labels = np.zeros(size + 1, dtype=np.int64)
+    labels[size] = -1
 
     areas = 0
-    for i in range(maze.rows):
-        for j in range(maze.columns):
-            if array[i][j] == -1:
-                areas += 1
-                queue = [(i, j, areas)]
+    for cell in range(size):
+        if labels[cell] != 0:
+            continue
+        areas += 1
+        labels[cell] = areas
+
+        frontier = np.array([cell])
+        while frontier.size != 0:
+            frontier = neighbors[frontier].ravel()
+            frontier = frontier[labels[frontier] == 0]
+            labels[frontier] = areas
+            if frontier.size > 1:
+                frontier = np.unique(frontier)
+
+    return labels[:size].reshape((maze.rows, maze.columns))
 
-                while len(queue) != 0:
+def flood_fill(maze : Maze) -> int:
+    '''
+    It is not indended to be used as a unique solver between START and FINISH.\n
+    It counts the total number of separate areas in a maze (see component_labels()).
+    '''
+    return int(component_labels(maze).max())
 
-                    (x, y, area_value) = queue.pop(0)
 
-                    array[x][y] = area_value
+class DistanceCache:
+    '''
+    Shortest path lengths (number of moves) in a maze, answered from BFS distance fields (see distance_field()) kept per source cell.\n
+    At most @capacity fields are kept, the least recently used one being dropped first. Everything is dropped once the maze
+    changes (see Maze.revision). Use Maze.distances() to share one cache per maze.
+    '''
 
-                    # North
-                    if maze.is_valid_position(x-1, y) and not maze.is_wall(x, y, x-1, y) and array[x-1][y] == -1:
-                        queue.append((x-1, y, area_value))
-                
-                    # East
-                    if maze.is_valid_position(x, y+1) and not maze.is_wall(x, y, x, y+1) and array[x][y+1] == -1:
-                        queue.append((x, y+1, area_value))
+    # Largest maze (in cells) all_pairs() accepts: the matrix takes 4 * cells^2 bytes.
+    ALL_PAIRS_LIMIT = 1024
 
-                    # South
-                    if maze.is_valid_position(x+1, y) and not maze.is_wall(x, y, x+1, y) and array[x+1][y] == -1:
-                        queue.append((x+1, y, area_value))
+    def __init__(self, maze : Maze, capacity : int = 64):
+        self.maze = maze
+        self.capacity = capacity
+        self.revision = maze.revision
+        self.fields = OrderedDict()
+        self.matrix = None
+
+    def _check(self):
+        if self.revision != self.maze.revision:
+            self.revision = self.maze.revision
+            self.fields.clear()
+            self.matrix = None
+
+    def field(self, start : tuple) -> np.ndarray:
+        '''
+        Distance from @start to every cell, as a (rows, columns) int array with -1 for the cells that cannot be reached.
+        Do not modify it.
+        '''
+        self._check()
+        source = start[0] * self.maze.columns + start[1]
+        if source in self.fields:
+            self.fields.move_to_end(source)
+            return self.fields[source]
+
+        if self.matrix is not None:
+            field = self.matrix[source].reshape((self.maze.rows, self.maze.columns))
+        else:
+            field = distance_field(self.maze, start)
+        self.fields[source] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
 
-                    # West
-                    if maze.is_valid_position(x, y-1) and not maze.is_wall(x, y, x, y-1) and array[x][y-1] == -1:
-                        queue.append((x, y-1, area_value))
+    def distance(self, start : tuple, end : tuple) -> int:
+        '''
+        Length of the shortest path from @start to @end (0 if they are the same cell), or -1 if there is none.\n
+        O(1) once all_pairs() was called, otherwise one BFS per new @start.
+        '''
+        self._check()
+        if self.matrix is not None:
+            columns = self.maze.columns
+            return int(self.matrix[start[0] * columns + start[1], end[0] * columns + end[1]])
+        return int(self.field(start)[end[0], end[1]])
 
-    return areas
+    def all_pairs(self) -> np.ndarray:
+        '''
+        Computes (once per maze revision) the distances between all pairs of cells, for small mazes (up to ALL_PAIRS_LIMIT cells).\n
+        Returns an int32 (cells, cells) matrix where entry [a, b] is the distance between the cells with ids a and b (x * columns + y).
+        All searches run at once, over as many copies of the neighbor table as there are cells (see bfs_distances()).
+        '''
+        self._check()
+        if self.matrix is None:
+            size = self.maze.rows * self.maze.columns
+            if size > self.ALL_PAIRS_LIMIT:
+                raise ValueError(f"The maze has {size} cells, all pairs distances are only computed for up to {self.ALL_PAIRS_LIMIT} cells.")
+
+            neighbors = self.maze.neighbors()
+            offsets = (np.arange(size) * size)[:, None, None]
+            copies = np.where(neighbors == -1, -1, neighbors + offsets).reshape((size * size, 4))
+            sources = np.arange(size) * size + np.arange(size)
+            self.matrix = bfs_distances(copies, sources).reshape((size, size)).astype(np.int32)
+        return self.matrix
 
 
 class MazeSolver:
@@ -110,7 +222,7 @@ class MazeSolver:
 
         frames = []
         proc = 10
-        cell_colors = dict()
+        cell_colors = self.maze.color_overlay()
         for i, step in enumerate(self.steps):
             if i >= len(self.steps) * (proc / 100):
                 print(f"[GIF][Solver]Progress: {proc}%")
@@ -121,9 +233,9 @@ class MazeSolver:
             if step == self.start or step == self.end:
                 continue
 
-            cell_colors[f"{step[0]}, {step[1]}"] = self.maze.CURRENT_CELL_COLOR
+            cell_colors[step[0], step[1]] = self.maze.CURRENT_CELL_COLOR
             frames.append(self.maze.export(show=False, cell_colors=cell_colors))
-            cell_colors[f"{step[0]}, {step[1]}"] = self.maze.VISITED_CELL_COLOR
+            cell_colors[step[0], step[1]] = self.maze.VISITED_CELL_COLOR
 
         frames[0].save(path, format="GIF", append_images=frames, save_all=True, duration=50)
         print(f"GIF created at {path}")
@@ -166,117 +278,90 @@ class MazeSolver:
 
 
 
-class DFS(MazeSolver):
-    def solve(self):
+class DepthFirstSolver(MazeSolver):
+    '''
+    Shared engine of the depth-first solvers (DFS, DFSRandom and DFSHeuristic), which only differ in the order
+    the neighbors of a cell are tried in (see neighbor_order()).\n
+    After solve(), self.trace holds the exploration trace as an int32 array of cell ids (x * columns + y): the cell on top
+    of the stack at every step, then the end. self.visited is a (rows, columns) boolean array of the cells that were reached.
+    '''
+
+    def neighbor_order(self) -> np.ndarray:
         '''
-        Uses the Depth-First search approach to find the shortes path from start to finish.
-        It uses a deterministic approach to search for the next path (clock-wise).
+        Returns a (rows * columns, 4) array where row i lists the open neighbors of cell i (see Maze.neighbors())
+        in the order they should be tried. It is computed once per solve.
         '''
+        return self.maze.neighbors()
 
-        self.cells = [self.start]
-        self.visited = [self.start]
-        self.steps.clear()
+    def search(self) -> list:
+        '''
+        Runs the depth-first search from start to end and fills self.trace and self.visited.\n
+        Returns the final stack, i.e. the path from start to end, as a list of cell ids.
+        '''
+        columns = self.maze.columns
+        order = self.neighbor_order().tolist()
+        start = self.start[0] * columns + self.start[1]
+        end = self.end[0] * columns + self.end[1]
+
+        visited = bytearray(len(order))
+        visited[start] = 1
+        stack = [start]
+        trace = []
+        while stack[-1] != end:
+            cell = stack[-1]
+            trace.append(cell)
+            for neighbor in order[cell]:
+                if neighbor != -1 and not visited[neighbor]:
+                    visited[neighbor] = 1
+                    stack.append(neighbor)
+                    break
+            else:
+                stack.pop()
+                if len(stack) == 0:
+                    raise ValueError(f"Could not find a connected path from {self.start} to {self.end}!")
+        trace.append(end)
 
-        while self.cells[-1] != self.end:
-            if len(self.cells) == 0:
-                raise ValueError(f"Could not find a connected path from {self.start} to {self.finish}!")
+        self.trace = np.array(trace, dtype=np.int32)
+        self.visited = np.frombuffer(visited, dtype=bool).reshape((self.maze.rows, columns))
+        return stack
 
-            (x, y) = self.cells[-1]
-            self.steps.append((x, y))
 
-            # North
-            if self.maze.is_valid_position(x-1, y) and not self.maze.is_wall(x, y, x-1, y) and not (x-1, y) in self.visited:
-                self.cells.append((x-1, y))
-                self.visited.append((x-1, y))
-                continue
-            
-            # East
-            if self.maze.is_valid_position(x, y+1) and not self.maze.is_wall(x, y, x, y+1) and not (x, y+1) in self.visited:
-                self.cells.append((x, y+1))
-                self.visited.append((x, y+1))
-                continue
+class DFS(DepthFirstSolver):
+    def solve(self):
+        '''
+        Uses the Depth-First search approach to find the shortes path from start to finish.
+        It uses a deterministic approach to search for the next path (clock-wise).\n
+        self.steps holds the full search (self.trace as (x, y) tuples), not only the final path.
+        '''
+        self.steps.clear()
+        self.search()
+        self.steps.extend(divmod(cell, self.maze.columns) for cell in self.trace.tolist())
 
-            # South
-            if self.maze.is_valid_position(x+1, y) and not self.maze.is_wall(x, y, x+1, y) and not (x+1, y) in self.visited:
-                self.cells.append((x+1, y))
-                self.visited.append((x+1, y))
-                continue
-            
-            # West
-            if self.maze.is_valid_position(x, y-1) and not self.maze.is_wall(x, y, x, y-1) and not (x, y-1) in self.visited:
-                self.cells.append((x, y-1))
-                self.visited.append((x, y-1))
-                continue
 
-            self.cells.pop()
-            
-        self.steps.append(self.end)
-        # # Deep copy the list
-        # # This only shows the final steps (we want the FULL search.)
-        # self.steps.clear()
-        # for cell in self.cells:
-        #     self.steps.append(cell)
+class DFSRandom(DepthFirstSolver):
+    def __init__(self, maze : Maze, start=None, end=None, seed=None):
+        '''
+        @seed: seed of the generator shuffling the neighbors. If None, it is drawn from the random module.
+        '''
+        super().__init__(maze, start, end)
+        self.rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
 
+    def neighbor_order(self) -> np.ndarray:
+        '''
+        Every cell gets its own random order of the four directions.
+        '''
+        neighbors = self.maze.neighbors()
+        return self.rng.permuted(neighbors, axis=1)
 
-class DFSRandom(MazeSolver):
     def solve(self):
         '''
         Uses the Depth-First search approach to find the shortes path from start to finish.
         It uses a random approach to search for the next path.
         '''
+        self.steps.clear()
+        self.steps.extend(divmod(cell, self.maze.columns) for cell in self.search())
 
-        self.cells = [self.start]
-        self.visited = [self.start]
-
-        while self.cells[-1] != self.end:
-            if len(self.cells) == 0:
-                raise ValueError(f"Could not find a connected path from {self.start} to {self.finish}!")
-
-            (x, y) = self.cells[-1]
-
-            order = ["North", "East", "South", "West"]
-            shuffle(order)
-
-            direction_set = False
-            for dir in order:
-                if dir == "North":
-                    if self.maze.is_valid_position(x-1, y) and not self.maze.is_wall(x, y, x-1, y) and not (x-1, y) in self.visited:
-                        self.cells.append((x-1, y))
-                        self.visited.append((x-1, y))
-                        direction_set = True
-                        break
-                
-                if dir == "East":
-                    if self.maze.is_valid_position(x, y+1) and not self.maze.is_wall(x, y, x, y+1) and not (x, y+1) in self.visited:
-                        self.cells.append((x, y+1))
-                        self.visited.append((x, y+1))
-                        direction_set = True
-                        break
-
-                if dir == "South":
-                    if self.maze.is_valid_position(x+1, y) and not self.maze.is_wall(x, y, x+1, y) and not (x+1, y) in self.visited:
-                        self.cells.append((x+1, y))
-                        self.visited.append((x+1, y))
-                        direction_set = True
-                        break
-                
-                if dir == "West":
-                    if self.maze.is_valid_position(x, y-1) and not self.maze.is_wall(x, y, x, y-1) and not (x, y-1) in self.visited:
-                        self.cells.append((x, y-1))
-                        self.visited.append((x, y-1))
-                        direction_set = True
-                        break
-            
-            if direction_set:
-                continue
-
-            self.cells.pop()
-            
-        # Deep copy the list
-        for cell in self.cells:
-            self.steps.append(cell)
 
-    
 class Lee(MazeSolver):
     '''
     Used to find the shortest possible path from start to finish.
@@ -284,36 +369,12 @@ class Lee(MazeSolver):
     
     def solve(self):
         '''
-        Applies the Lee Traversal Algorithm on the given maze.
+        Applies the Lee Traversal Algorithm on the given maze.\n
+        The distance of every cell from the start is kept in self.array (see distance_field()).
         '''
-        queue = [(self.start[0], self.start[1], 0)]
-
-        # Mark all cells as unvisited with -1.
-        self.array = np.full((self.maze.rows, self.maze.columns), -1)
-
-        while len(queue) != 0:
-
-            (x, y, current_value) = queue.pop(0)
+        self.array = distance_field(self.maze, self.start)
 
-            self.array[x][y] = current_value
-
-            # North
-            if self.maze.is_valid_position(x-1, y) and not self.maze.is_wall(x, y, x-1, y) and self.array[x-1][y] == -1:
-                queue.append((x-1, y, current_value+1))
-        
-            # East
-            if self.maze.is_valid_position(x, y+1) and not self.maze.is_wall(x, y, x, y+1) and self.array[x][y+1] == -1:
-                queue.append((x, y+1, current_value+1))
-
-            # South
-            if self.maze.is_valid_position(x+1, y) and not self.maze.is_wall(x, y, x+1, y) and self.array[x+1][y] == -1:
-                queue.append((x+1, y, current_value+1))
-
-            # West
-            if self.maze.is_valid_position(x, y-1) and not self.maze.is_wall(x, y, x, y-1) and self.array[x][y-1] == -1:
-                queue.append((x, y-1, current_value+1))
-
-        if self.array[self.maze.rows-1][self.maze.columns-1] == -1:
+        if self.array[self.end[0]][self.end[1]] == -1:
             # self.maze.export(output=None)
             raise RuntimeError(f"Could not find a path from start {self.start} to finish {self.end}!")
 
@@ -321,18 +382,19 @@ class Lee(MazeSolver):
         self.steps.append(self.end)
         while self.steps[-1] != self.start:
             (row, col) = self.steps[-1]
+            neighbors = self.maze.neighbors()[row * self.maze.columns + col]
 
             # Find a suitable position to go towards
-            if self.maze.is_valid_position(row-1, col) and not self.maze.is_wall(row, col, row-1, col) and self.array[row][col] - 1 == self.array[row-1][col]:
+            if neighbors[0] != -1 and self.array[row][col] - 1 == self.array[row-1][col]:
                 self.steps.append((row-1, col))
                 continue
-            if self.maze.is_valid_position(row, col+1) and not self.maze.is_wall(row, col, row, col+1) and self.array[row][col] - 1 == self.array[row][col+1]:
+            if neighbors[1] != -1 and self.array[row][col] - 1 == self.array[row][col+1]:
                 self.steps.append((row, col+1))
                 continue
-            if self.maze.is_valid_position(row+1, col) and not self.maze.is_wall(row, col, row+1, col) and self.array[row][col] - 1 == self.array[row+1][col]:
+            if neighbors[2] != -1 and self.array[row][col] - 1 == self.array[row+1][col]:
                 self.steps.append((row+1, col))
                 continue
-            if self.maze.is_valid_position(row, col-1) and not self.maze.is_wall(row, col, row, col-1) and self.array[row][col] - 1 == self.array[row][col-1]:
+            if neighbors[3] != -1 and self.array[row][col] - 1 == self.array[row][col-1]:
                 self.steps.append((row, col-1))
                 continue
 
@@ -343,133 +405,335 @@ class Lee(MazeSolver):
         A maze is connected if all cells are accessible.
         '''
 
-        for i in range(self.maze.rows):
-            for j in range(self.maze.columns):
-                if self.array[i][j] == -1:
-                    return False
-        return True
+        return bool((self.array != -1).all())
 
     def score(self):
         return self.array[self.end[0]][self.end[1]]
 
 
+class BidirectionalBFS(MazeSolver):
+    '''
+    Shortest path from start to finish, searched from both ends at once.
+    '''
+
+    def solve(self):
+        '''
+        Grows one BFS frontier from the start and one from the end, always expanding a whole level of the smaller one,
+        and stops at the first level where they meet. Both searches keep a parent array indexed by cell id
+        (x * columns + y), from which the path is rebuilt.\n
+        The number of cells expanded by both searches is kept in self.expanded.
+        '''
+        self.steps.clear()
+
+        columns = self.maze.columns
+        neighbors = self.maze.neighbors()
+        start = self.start[0] * columns + self.start[1]
+        end = self.end[0] * columns + self.end[1]
+
+        size = self.maze.rows * columns
+        # parents[0] belongs to the search from the start, parents[1] to the one from the end (-1 = not reached yet)
+        parents = ([-1] * size, [-1] * size)
+        parents[0][start] = start
+        parents[1][end] = end
+        frontiers = ([start], [end])
+        self.expanded = 0
+
+        meeting = start if start == end else None
+        while meeting is None:
+            if len(frontiers[0]) == 0 or len(frontiers[1]) == 0:
+                raise ValueError(f"Could not find a connected path from {self.start} to {self.end}!")
+
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            (parent, other) = (parents[side], parents[1 - side])
+            level = []
+            for cell in frontiers[side]:
+                self.expanded += 1
+                for neighbor in neighbors[cell].tolist():
+                    if neighbor == -1 or parent[neighbor] != -1:
+                        continue
+                    parent[neighbor] = cell
+                    level.append(neighbor)
+                    # No cell was reached by both searches before this level, so any meeting cell is on a shortest path
+                    if other[neighbor] != -1 and meeting is None:
+                        meeting = neighbor
+            frontiers[side][:] = level
+
+        cell = meeting
+        while cell != start:
+            self.steps.append(divmod(cell, columns))
+            cell = parents[0][cell]
+        self.steps.append(self.start)
+        self.steps.reverse()
+
+        cell = meeting
+        while cell != end:
+            cell = parents[1][cell]
+            self.steps.append(divmod(cell, columns))
+
+
+class JunctionSolver(MazeSolver):
+    '''
+    Shortest path from start to finish, searched on the junction graph of the maze (see Maze.junction_graph()).
+    The graph is built once per maze and shared by all solvers, so it pays off when a maze is solved many times.
+    '''
+
+    def solve(self):
+        self.steps.clear()
+        path = self.maze.junction_graph().path(self.start, self.end)
+        self.steps.extend(divmod(cell, self.maze.columns) for cell in path)
+
+
+class HierarchicalSolver(MazeSolver):
+    '''
+    Shortest path from start to finish for very large mazes, searched on the cluster graph of the maze (see Maze.cluster_graph()).
+    '''
+
+    def __init__(self, maze : Maze, start=None, end=None, size : int = 16):
+        '''
+        @size: side of the clusters, in cells.
+        '''
+        super().__init__(maze, start, end)
+        self.size = size
+
+    def solve(self):
+        self.steps.clear()
+        path = self.maze.cluster_graph(self.size).path(self.start, self.end)
+        self.steps.extend(divmod(cell, self.maze.columns) for cell in path)
+
+
 class AStar(MazeSolver):
 
     def solve(self, h = None):
         '''
-        A* algorithm implementation using a BFS jumping method (the agent "jumps" from one known cell to another).
+        A* algorithm implementation using a binary heap as open set.
         G cost = distance from the starting node
         H cost (heuristic) = distance to the end node
         F cost = G+H
-        selected new cell = min(F), if there are multiple of the same value, min(H) \n
+        selected new cell = min(F), if there are multiple of the same value, min(G), then the oldest one \n
+        The number of cells expanded is kept in self.expanded.\n
+        Cells are identified by their id (x * columns + y). A cell may be pushed multiple times (when a shorter path to it is found);
+        the outdated heap entries are skipped when popped instead of being searched for and removed.\n
 
-        @h  : what heuristic function to use. Defaults to classical Euclidian distance.
+        @h  : what heuristic function to use (e.g. standard_euclidian, standard_manhattan, standard_minkowski). Defaults to classical Euclidian distance.
         '''
         self.steps.clear()
 
-        def _h(start, end):
-            (x, y) = start
-            (endx, endy) = end
+        h = h or standard_euclidian
+
+        columns = self.maze.columns
+        neighbors = self.maze.neighbors()
+        start = self.start[0] * columns + self.start[1]
+        end = self.end[0] * columns + self.end[1]
+
+        size = self.maze.rows * columns
+        gvalue = [size] * size
+        parent = [-1] * size
+        closed = bytearray(size)
+
+        gvalue[start] = 0
+        heap = [(h(self.start, self.end), 0, 0, start)]
+        self.expanded = 0
+        seq = 1
+        while heap:
+            (_, g, _, cell) = heapq.heappop(heap)
+            if closed[cell]:
+                continue
+            closed[cell] = 1
+            self.expanded += 1
 
-            return ((x-endx)**2 + (y-endy)**2) ** (0.5)
-        
-        h = h or _h
-
-        bfs = [
-            {
-                "node" : self.start,
-                "gvalue": 0,
-                "fvalue": h(self.start, self.end) + 0,
-                "parent_index": -1,
-                "closed": False
-            }
-        ]
-        visited = []
-
-        iter = 0
-        while True:
-            iter += 1
-            # Select the node with the minimum F value
-            curr_node = None
-            for node_element in bfs:
-                if node_element["closed"]:
-                    continue
-                if curr_node is None:
-                    curr_node = node_element
+            if cell == end:
+                break
+
+            g += 1
+            for neighbor in neighbors[cell].tolist():
+                if neighbor == -1 or closed[neighbor] or g >= gvalue[neighbor]:
                     continue
-                fvalue = node_element["fvalue"]
-                gvalue = node_element["gvalue"]
-
-                if fvalue < curr_node["fvalue"]:
-                    curr_node = node_element
-                elif fvalue == curr_node["fvalue"] and gvalue < curr_node["gvalue"]:
-                    curr_node = node_element
-            
-            if curr_node is None:
-                print("current node is None!")
-                print(f"END NODE: {self.end}")
-                print(*bfs, sep='\n')
-
-                cc = {}
-                for node in bfs:
-                    (x, y) = node["node"]
-                    cc[f"{x}, {y}"] = (node["gvalue"]*1.5+100, 0, 0) 
-
-                self.maze.export(output="tmp/astar_error.png", cell_colors=cc)
-                raise ValueError("[AStar] Current node is None!")
-            
-            curr_node["closed"] = True
-
-            visited.append(curr_node["node"])
-
-            if curr_node["node"] == self.end:
+                gvalue[neighbor] = g
+                parent[neighbor] = cell
+                heapq.heappush(heap, (g + h(divmod(neighbor, columns), self.end), g, seq, neighbor))
+                seq += 1
+        else:
+            raise ValueError(f"[AStar] There is no path from {self.start} to {self.end}.")
+
+        cell = end
+        while cell != -1:
+            self.steps.append(divmod(cell, columns))
+            cell = parent[cell]
+        self.steps.reverse()
+
+
+class DStarLite(MazeSolver):
+    '''
+    Incremental shortest path from start to finish (D* Lite), for agents that keep moving and discover the maze as they go.\n
+    Only the cells marked in @known are trusted: moving into a known cell costs 1 if there is no wall in between, moving
+    into an unknown cell costs @unknown_cost whatever the walls are (None: unknown cells are never entered).
+    The search runs backwards, from the end, and its state is kept between calls of solve(): after move() and reveal()
+    only the part of the previous search they affect is repaired, instead of searching again from scratch.
+    '''
+
+    def __init__(self, maze : Maze, start=None, end=None, known : np.ndarray = None, unknown_cost : float = None):
+        '''
+        @known: (rows, columns) boolean array of the known cells (it is copied). By default every cell is known.
+        @unknown_cost: cost of moving into an unknown cell, at least 1 keeps the paths the shortest ones.
+        '''
+        super().__init__(maze, start, end)
+        self.revision = maze.revision
+        self.unknown_cost = unknown_cost
+        self.known = np.ones((maze.rows, maze.columns), dtype=bool) if known is None else np.array(known, dtype=bool)
+        self._known = self.known.ravel().tolist()
+
+        # adjacent[cell][d]: the active cell next to @cell in direction d (-1 if none), open[cell][d] if no wall is in between
+        columns = maze.columns
+        ids = np.arange(maze.rows * columns).reshape((maze.rows, columns))
+        active = maze.get_active_mask()
+        adjacent = np.full((maze.rows, columns, 4), -1, dtype=np.int64)
+        adjacent[1:, :, 0] = np.where(active[:-1, :], ids[:-1, :], -1)
+        adjacent[:, :-1, 1] = np.where(active[:, 1:], ids[:, 1:], -1)
+        adjacent[:-1, :, 2] = np.where(active[1:, :], ids[1:, :], -1)
+        adjacent[:, 1:, 3] = np.where(active[:, :-1], ids[:, :-1], -1)
+        self._adjacent = adjacent.reshape((-1, 4)).tolist()
+        self._open = maze.neighbors().tolist()
+
+        # Manhattan distance times the cheapest move never overestimates
+        self._scale = 1 if unknown_cost is None else min(1, unknown_cost)
+
+        size = maze.rows * columns
+        self._start = self.start[0] * columns + self.start[1]
+        self._end = self.end[0] * columns + self.end[1]
+        self.g = [float("inf")] * size
+        self.rhs = [float("inf")] * size
+        self.rhs[self._end] = 0
+        self.km = 0
+        # key[cell] is the key cell was last queued with (None if not queued); older heap entries are skipped when popped
+        self._key = [None] * size
+        self._heap = []
+        self._push(self._end)
+        self.expanded = 0
+
+    def _h(self, cell : int) -> float:
+        (x, y) = divmod(cell, self.maze.columns)
+        return (abs(x - self.start[0]) + abs(y - self.start[1])) * self._scale
+
+    def _cost(self, cell : int, d : int) -> float:
+        '''
+        Cost of the move from @cell in direction @d.
+        '''
+        other = self._adjacent[cell][d]
+        if other == -1:
+            return float("inf")
+        if self._known[other]:
+            return 1 if self._open[cell][d] == other else float("inf")
+        return float("inf") if self.unknown_cost is None else self.unknown_cost
+
+    def _push(self, cell : int):
+        best = min(self.g[cell], self.rhs[cell])
+        self._key[cell] = (best + self._h(cell) + self.km, best)
+        heapq.heappush(self._heap, (self._key[cell], cell))
+
+    def _top(self) -> tuple:
+        while self._heap and self._heap[0][0] != self._key[self._heap[0][1]]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else (float("inf"), float("inf"))
+
+    def _update(self, cell : int):
+        if cell != self._end:
+            rhs = float("inf")
+            for (d, other) in enumerate(self._adjacent[cell]):
+                if other != -1:
+                    rhs = min(rhs, self._cost(cell, d) + self.g[other])
+            self.rhs[cell] = rhs
+        if self.g[cell] != self.rhs[cell]:
+            self._push(cell)
+        else:
+            self._key[cell] = None
+
+    def _compute(self):
+        start = self._start
+        while True:
+            top = self._top()
+            best = min(self.g[start], self.rhs[start])
+            if top >= (best + self.km, best) and self.rhs[start] == self.g[start]:
                 break
-            
-            # Check each neighbour and add it to the queue
-            (x, y) = curr_node["node"]
-            _list = self.maze.possible_actions(x, y)
-
-            for move in _list:
-                newx = x
-                newy = y
-                if move == Maze.NORTH: newx = x-1
-                elif move == Maze.EAST: newy = y+1
-                elif move == Maze.SOUTH: newx = x+1
-                elif move == Maze.WEST: newy = y-1
-                else:
-                    raise ValueError(f"Unknown move type <{move}>")
-
-
-                found = False
-                for node_element in bfs:
-                    # It already exists
-                    if node_element["node"] == (newx, newy):
-                        new_fvalue = curr_node["gvalue"] + 1 + h((newx, newy), self.end)
-                        if node_element["fvalue"] > new_fvalue:
-                            node_element["gvalue"] = curr_node["gvalue"] + 1
-                            node_element["fvalue"] = new_fvalue
-
-                            node_element["parent_index"] = bfs.index(curr_node)
-
-                        found = True
-
-                if not found:
-                    bfs.append(
-                        {
-                            "node": (newx, newy),
-                            "gvalue": curr_node["gvalue"] + 1,
-                            "fvalue": curr_node["gvalue"] + 1 + h((newx, newy), self.end),
-                            "parent_index": bfs.index(curr_node),
-                            "closed":False
-                        }
-                    )
-        
-        node = bfs[-1]
-        while node["parent_index"] != -1:
-            self.steps.append(node["node"])
-            node = bfs[node["parent_index"]]
-        self.steps.append(self.start) 
-        self.steps.reverse()         
+            (_, cell) = heapq.heappop(self._heap)
+            self._key[cell] = None
+            best = min(self.g[cell], self.rhs[cell])
+            if top < (best + self._h(cell) + self.km, best):
+                self._push(cell)
+                continue
+
+            self.expanded += 1
+            if self.g[cell] > self.rhs[cell]:
+                self.g[cell] = self.rhs[cell]
+            else:
+                self.g[cell] = float("inf")
+                self._update(cell)
+            # The cells that can move into @cell are its adjacent ones
+            for other in self._adjacent[cell]:
+                if other != -1:
+                    self._update(other)
+
+    def move(self, start : tuple):
+        '''
+        The agent is now at @start: the next solve() starts from there.
+        '''
+        self.km += self._h(start[0] * self.maze.columns + start[1])
+        self.start = start
+        self._start = start[0] * self.maze.columns + start[1]
+
+    def reveal(self, cells):
+        '''
+        Marks the (x, y) @cells as known: only the moves into them change cost, so only their neighbors are searched again.
+        '''
+        for (x, y) in cells:
+            cell = x * self.maze.columns + y
+            if self._known[cell]:
+                continue
+            self._known[cell] = True
+            self.known[x, y] = True
+            for other in self._adjacent[cell]:
+                if other != -1:
+                    self._update(other)
+
+    def solve(self, choose=None):
+        '''
+        Repairs the search and fills self.steps with a cheapest path from start to end (both included).
+        The number of cells expanded since the planner was created is kept in self.expanded.\n
+        The path is followed depth-first, trying the moves by cost to go (cost of the move + remaining cost).
+        @choose, if given, is called with that sorted list of (x, y) candidates at every step and returns the index of
+        the one to try (0 being the cheapest), e.g. to explore worse moves. Only cells the search reached are candidates.\n
+        Raises ValueError if the maze changed since the planner was created, or if there is no path.
+        '''
+        if self.revision != self.maze.revision:
+            raise ValueError("The maze changed since the planner was created, a new one is needed.")
+
+        self._compute()
+        self.steps.clear()
+        if self.g[self._start] == float("inf"):
+            raise ValueError(f"Could not find a connected path from {self.start} to {self.end}!")
+
+        columns = self.maze.columns
+        visited = {self._start}
+        stack = [self._start]
+        while stack[-1] != self._end:
+            cell = stack[-1]
+            candidates = []
+            for (d, other) in enumerate(self._adjacent[cell]):
+                if other != -1 and other not in visited:
+                    cost = self._cost(cell, d) + self.g[other]
+                    if cost != float("inf"):
+                        candidates.append((cost, other))
+            if len(candidates) == 0:
+                stack.pop()
+                if len(stack) == 0:
+                    raise ValueError(f"Could not find a connected path from {self.start} to {self.end}!")
+                continue
+            candidates.sort()
+            index = 0 if choose is None else choose([divmod(other, columns) for (_, other) in candidates])
+            (_, other) = candidates[index]
+            visited.add(other)
+            stack.append(other)
+
+        self.steps.extend(divmod(cell, columns) for cell in stack)
 
 
 class ReinforcementLearningSolver(MazeSolver):
@@ -515,58 +779,20 @@ class ReinforcementLearningSolver(MazeSolver):
             print(f"Surpassed the maximum allowed number of iterations ({max_iter}).")
         
     
-class DFSHeuristic(MazeSolver):
+class DFSHeuristic(DepthFirstSolver):
+    def neighbor_order(self) -> np.ndarray:
+        '''
+        The neighbors of each cell sorted by the heuristic distance to the end (ties keep the NORTH, EAST, SOUTH, WEST order).
+        '''
+        neighbors = self.maze.neighbors()
+        distances = np.array([self.h(divmod(cell, self.maze.columns), self.end) for cell in range(len(neighbors))] + [np.inf])
+        return np.take_along_axis(neighbors, np.argsort(distances[neighbors], axis=1, kind="stable"), axis=1)
+
     def solve(self, h=None):
         '''
-        Adds to the stack based on a heuristic distance.
+        Adds to the stack based on a heuristic distance.\n
+        @h  : what heuristic function to use. Defaults to classical Euclidian distance.
         '''
         self.steps.clear()
-
-
-        def _h(start, end):
-            (x, y) = start
-            (endx, endy) = end
-
-            return ((x-endx)**2 + (y-endy)**2) ** (0.5)
-        
-        h = _h if h is None else h
-        self.cells = [self.start]
-
-        while self.cells[-1] != self.end:
-            (x, y) = self.cells[-1]
-            self.visited.append((x, y))
-
-            pqueue = []
-            # North
-            if self.maze.is_valid_position(x-1, y) and not self.maze.is_wall(x, y, x-1, y) and not (x-1, y) in self.visited:
-                distance = h((x-1, y), self.end)
-                pqueue.append((x-1, y, distance))
-            
-            # East
-            if self.maze.is_valid_position(x, y+1) and not self.maze.is_wall(x, y, x, y+1) and not (x, y+1) in self.visited:
-                distance = h((x, y+1), self.end)
-                pqueue.append((x, y+1, distance))
-            
-            # South
-            if self.maze.is_valid_position(x+1, y) and not self.maze.is_wall(x, y, x+1, y) and not (x+1, y) in self.visited:
-                distance = h((x+1, y), self.end)
-                pqueue.append((x+1, y, distance))
-            
-            # West
-            if self.maze.is_valid_position(x, y-1) and not self.maze.is_wall(x, y, x, y-1) and not (x, y-1) in self.visited:
-                distance = h((x, y-1), self.end)
-                pqueue.append((x, y-1, distance))
-
-            if len(pqueue) != 0:
-                # Sort the queue based on distance
-                pqueue.sort(key=lambda tup:tup[2])
-                self.cells.append((pqueue[0][0], pqueue[0][1]))
-            else:
-                self.cells.pop()
-
-            if len(self.cells) == 0:
-                raise ValueError(f"Could not find a connected path from {self.start} to {self.end}!")
-            
-        # Deep copy the list
-        for cell in self.cells:
-            self.steps.append(cell)
\ No newline at end of file
+        self.h = h or standard_euclidian
+        self.steps.extend(divmod(cell, self.maze.columns) for cell in self.search())
@@ -0,0 +1,121 @@
+'''
+Benchmark for distance_field() (used by Lee) and component_labels() (used by flood_fill()).
+
+Compares the level-synchronous BFS against the original queue based one (kept below as reference) and checks that
+both give the same distances and the same number of areas. Two kinds of mazes are used: perfect mazes (one long
+corridor tree, built by DepthFirstSearch) and random walls (areas with loops, like GA individuals). The legacy
+BFS enqueues a cell once for every path reaching it, which explodes on loops: keep the random walls sizes small.
+Last, the distances of a whole batch of perfect mazes (MazeBatch.distance_fields()) are compared to one legacy BFS per maze.
+
+Run from maze-generator/v2 with:
+    python -m benchmarks.bfs [--sizes 32 64 128] [--random-sizes 12 16 20] [--batch 256] [--repeat 3]
+'''
+import argparse
+import time
+import numpy as np
+
+from amazed.modules.maze import Maze, ArrayMaze
+from amazed.modules.batch import MazeBatch
+from amazed.modules.build import DepthFirstSearch
+from amazed.modules.solver import distance_field, flood_fill
+
+
+def legacy_distance_field(maze: Maze, start: tuple) -> np.ndarray:
+    '''
+    The BFS Lee.solve() used before distance_field(): a list used as queue and cells marked only when dequeued.
+    '''
+    queue = [(start[0], start[1], 0)]
+    array = np.full((maze.rows, maze.columns), -1)
+    while len(queue) != 0:
+        (x, y, current_value) = queue.pop(0)
+        array[x][y] = current_value
+        neighbors = maze.neighbors()[x * maze.columns + y]
+        if neighbors[0] != -1 and array[x-1][y] == -1:
+            queue.append((x-1, y, current_value+1))
+        if neighbors[1] != -1 and array[x][y+1] == -1:
+            queue.append((x, y+1, current_value+1))
+        if neighbors[2] != -1 and array[x+1][y] == -1:
+            queue.append((x+1, y, current_value+1))
+        if neighbors[3] != -1 and array[x][y-1] == -1:
+            queue.append((x, y-1, current_value+1))
+    return array
+
+
+def legacy_flood_fill(maze: Maze) -> int:
+    '''
+    The flood_fill() used before component_labels(): the same queue based BFS, from every cell not reached yet.
+    '''
+    array = np.full((maze.rows, maze.columns), -1)
+    areas = 0
+    for i in range(maze.rows):
+        for j in range(maze.columns):
+            if array[i][j] == -1:
+                areas += 1
+                queue = [(i, j)]
+                while len(queue) != 0:
+                    (x, y) = queue.pop(0)
+                    array[x][y] = areas
+                    neighbors = maze.neighbors()[x * maze.columns + y]
+                    if neighbors[0] != -1 and array[x-1][y] == -1:
+                        queue.append((x-1, y))
+                    if neighbors[1] != -1 and array[x][y+1] == -1:
+                        queue.append((x, y+1))
+                    if neighbors[2] != -1 and array[x+1][y] == -1:
+                        queue.append((x+1, y))
+                    if neighbors[3] != -1 and array[x][y-1] == -1:
+                        queue.append((x, y-1))
+    return areas
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return (result, best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--random-sizes", type=int, nargs="+", default=[12, 16, 20])
+    parser.add_argument("--batch", type=int, default=256, help="number of mazes of the batch search")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'maze':>20} {'legacy Lee (ms)':>16} {'Lee (ms)':>9} {'speedup':>8} {'legacy fill (ms)':>17} {'fill (ms)':>10} {'speedup':>8}")
+    for (kind, sizes) in [("perfect", args.sizes), ("random walls", args.random_sizes)]:
+        for size in sizes:
+            maze = ArrayMaze(size, size)
+            if kind == "perfect":
+                DepthFirstSearch(maze, seed=0)
+            else:
+                maze.set_wall_bits(rng.random(len(maze.get_wall_bits())) < 0.35)
+            maze.neighbors()
+
+            (legacy_distances, legacy_lee) = timed(lambda: legacy_distance_field(maze, (0, 0)), args.repeat)
+            (distances, lee) = timed(lambda: distance_field(maze, (0, 0)), args.repeat)
+            (legacy_areas, legacy_fill) = timed(lambda: legacy_flood_fill(maze), args.repeat)
+            (areas, fill) = timed(lambda: flood_fill(maze), args.repeat)
+
+            assert np.array_equal(legacy_distances, distances), f"Distances differ for {kind} {size}x{size}"
+            assert legacy_areas == areas, f"Areas differ for {kind} {size}x{size}: {legacy_areas} != {areas}"
+            name = f"{kind} {size}x{size}"
+            print(f"{name:>20} {legacy_lee * 1000:>16.2f} {lee * 1000:>9.2f} {legacy_lee / lee:>7.1f}x {legacy_fill * 1000:>17.2f} {fill * 1000:>10.2f} {legacy_fill / fill:>7.1f}x")
+
+    size = args.sizes[0]
+    mazes = []
+    for seed in range(args.batch):
+        mazes.append(ArrayMaze(size, size))
+        DepthFirstSearch(mazes[-1], seed=seed)
+    batch = MazeBatch.from_mazes(mazes)
+    (legacy_distances, legacy_batch) = timed(lambda: np.stack([legacy_distance_field(maze, (0, 0)) for maze in mazes]), args.repeat)
+    (distances, batch_time) = timed(lambda: batch.distance_fields(), args.repeat)
+    assert np.array_equal(legacy_distances, distances), "Batch distances differ"
+    print(f"\nBatch of {args.batch} perfect mazes of {size}x{size}: legacy {legacy_batch * 1000:.2f} ms, batch {batch_time * 1000:.2f} ms ({legacy_batch / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
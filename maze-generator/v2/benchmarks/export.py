@@ -0,0 +1,91 @@
+'''
+Benchmark for Maze.export().
+
+Compares the vectorized renderer against the original per-pixel loops (kept below as reference)
+and checks that both produce identical images.
+
+Run from maze-generator/v2 with:
+    python -m benchmarks.export [--sizes 64 512] [--distances 2 5 10]
+'''
+import argparse
+import time
+import numpy as np
+
+from amazed.modules.maze import Maze, ArrayMaze, render
+from amazed.modules.build import DepthFirstSearch
+
+
+def legacy_render(maze: Maze, distance: int, cell_colors: dict, checkers: bool = True) -> np.ndarray:
+    '''
+    The per-pixel implementation Maze.export() used before the vectorized renderer.
+    '''
+    new_data = np.zeros((maze.rows * distance + 1, maze.columns * distance + 1, 3), dtype=np.uint8)
+    walls = maze.get_wall_mask()
+    active = maze.get_active_mask()
+
+    for i in range(maze.rows):
+        for j in range(maze.columns):
+            for k1 in range(distance):
+                for k2 in range(distance):
+                    key = f"{i}, {j}"
+                    if not active[i][j]:
+                        color = Maze.WALL_COLOR
+                    elif key in cell_colors:
+                        color = cell_colors[key]
+                    elif checkers:
+                        color = Maze.CHECKERS_1 if (i+j) % 2 == 0 else Maze.CHECKERS_2
+                    else:
+                        color = Maze.DEFAULT_COLOR
+                    for c in range(3):
+                        new_data[i*distance+k1][j*distance+k2][c] = color[c]
+
+            if walls[i][j] & Maze.WEST_BIT:
+                for k in range(distance):
+                    for c in range(3):
+                        new_data[i*distance+k][j*distance][c] = Maze.WALL_COLOR[c]
+            if walls[i][j] & Maze.NORTH_BIT:
+                for k in range(distance):
+                    for c in range(3):
+                        new_data[i*distance][j*distance+k][c] = Maze.WALL_COLOR[c]
+
+    for i in range(maze.rows):
+        for c in range(3):
+            new_data[i][-1][c] = Maze.WALL_COLOR[c]
+    for i in range(maze.columns):
+        for c in range(3):
+            new_data[-1][i][c] = Maze.WALL_COLOR[c]
+    return new_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 512])
+    parser.add_argument("--distances", type=int, nargs="+", default=[2, 5, 10])
+    args = parser.parse_args()
+
+    print(f"{'size':>9} {'distance':>8} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for size in args.sizes:
+        maze = ArrayMaze(size, size)
+        DepthFirstSearch(maze, seed=0)
+
+        # Color a diagonal, similar to what Sculptor.add_frame does
+        cell_colors = {f"{i}, {i}": Maze.VISITED_CELL_COLOR for i in range(size)}
+        overlay = maze.color_overlay()
+        for i in range(size):
+            overlay[i, i] = Maze.VISITED_CELL_COLOR
+
+        for distance in args.distances:
+            start = time.perf_counter()
+            expected = legacy_render(maze, distance, cell_colors)
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = render(maze.walls, maze.active, distance, overlay)
+            vectorized_time = time.perf_counter() - start
+
+            assert np.array_equal(expected, result), f"Images differ for size {size} and distance {distance}"
+            print(f"{f'{size}x{size}':>9} {distance:>8} {legacy_time:>12.4f} {vectorized_time:>15.4f} {legacy_time / vectorized_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+'''
+Benchmark for the rewritten Sculptors.
+
+Each one is compared against its original implementation (kept below as reference) on square mazes of growing size,
+and both are checked to carve perfect mazes (all cells connected, no loops). The walls themselves differ, as the random
+numbers are not drawn in the same order. The original implementations slow down much faster than the new ones, so they
+only run up to a size of their own (see LEGACY), or up to --legacy-max if given.
+
+Run from maze-generator/v2 with:
+    python -m benchmarks.sculptors [--sculptors RandomKruskal ... Sidewinder] [--sizes 32 128 512] [--legacy-max 128] [--repeat 1]
+'''
+import argparse
+import random
+import time
+import numpy as np
+
+from amazed.modules.maze import Maze, ArrayMaze
+from amazed.modules import build
+from amazed.modules.components import count_areas
+
+
+class LegacyRandomKruskal(build.Sculptor):
+    '''
+    RandomKruskal before the DisjointSet: cell sets as lists of [i, j] lists, found by linear scans.
+    '''
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        super().__init__(maze, seed, gif)
+
+        list_of_cells = []
+        for i in range(maze.rows):
+            for j in range(maze.columns):
+                list_of_cells.append([ [i, j] ])
+
+        list_of_edges = []
+        for i in range(maze.rows):
+            for j in range(maze.columns):
+                if maze.is_valid_position(i-1, j):
+                    list_of_edges.append((i, j, i-1, j))
+                if maze.is_valid_position(i+1, j):
+                    list_of_edges.append((i, j, i+1, j))
+                if maze.is_valid_position(i, j-1):
+                    list_of_edges.append((i, j, i, j-1))
+                if maze.is_valid_position(i, j+1):
+                    list_of_edges.append((i, j, i, j+1))
+
+        random.shuffle(list_of_edges)
+        for edge in list_of_edges:
+            x1, y1, x2, y2 = edge
+
+            cell_set_1 = list_of_cells[0]
+            for cell_set in list_of_cells:
+                if [x1, y1] in cell_set:
+                    cell_set_1 = cell_set
+                    break
+            cell_set_2 = list_of_cells[0]
+            for cell_set in list_of_cells:
+                if [x2, y2] in cell_set:
+                    cell_set_2 = cell_set
+                    break
+
+            if cell_set_1 != cell_set_2:
+                new_cell_list = cell_set_1 + cell_set_2
+                new_cell_list = new_cell_list.copy()
+                list_of_cells.append(new_cell_list)
+                list_of_cells.remove(cell_set_1)
+                list_of_cells.remove(cell_set_2)
+
+                self.carve(x1, y1, x2, y2)
+
+        self.flush()
+
+
+class LegacyRandomPrim(build.Sculptor):
+    '''
+    RandomPrim before the indexed frontier: rebuilt from every visited cell and shuffled whole at every step.
+    '''
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False, x: int = None, y: int = None) -> None:
+        super().__init__(maze, seed, gif)
+
+        x = maze.rows // 2 if x is None else x
+        y = maze.columns // 2 if y is None else y
+
+        visited = set()
+
+        visited.add((x, y))
+        frontier = []
+        while len(visited) != maze.rows * maze.columns:
+            for (x, y) in visited:
+                if (x-1, y) not in visited and maze.is_valid_position(x-1, y) and (x, y, x-1, y) not in frontier:
+                    frontier.append((x, y, x-1, y))
+                if (x, y+1) not in visited and maze.is_valid_position(x, y+1) and (x, y, x, y+1) not in frontier:
+                    frontier.append((x, y, x, y+1))
+                if (x+1, y) not in visited and maze.is_valid_position(x+1, y) and (x, y, x+1, y) not in frontier:
+                    frontier.append((x, y, x+1, y))
+                if (x, y-1) not in visited and maze.is_valid_position(x, y-1) and (x, y, x, y-1) not in frontier:
+                    frontier.append((x, y, x, y-1))
+
+            random.shuffle(frontier)
+
+            for x1, y1, x2, y2 in frontier:
+                if (x2, y2) not in visited:
+                    break
+
+            self.carve(x1, y1, x2, y2)
+            visited.add((x2, y2))
+
+        self.flush()
+
+
+class LegacyAldousBroder(build.Sculptor):
+    '''
+    AldousBroder before the remaining cells counter: the whole visited array is checked at every step of the walk.
+    '''
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        super().__init__(maze, seed, gif)
+
+        visited = np.full((maze.rows, maze.columns), False)
+
+        x = random.randint(0, maze.rows-1)
+        y = random.randint(0, maze.columns-1)
+
+        while not np.all(visited):
+            visited[x][y] = True
+
+            possible_directions = []
+            if maze.is_valid_position(x-1, y):
+                possible_directions.append((x-1, y))
+            if maze.is_valid_position(x, y+1):
+                possible_directions.append((x, y+1))
+            if maze.is_valid_position(x+1, y):
+                possible_directions.append((x+1, y))
+            if maze.is_valid_position(x, y-1):
+                possible_directions.append((x, y-1))
+
+            random.shuffle(possible_directions)
+            found_dir = False
+            for dir in possible_directions:
+                if not visited[dir[0]][dir[1]]:
+                    self.carve(x, y, dir[0], dir[1])
+
+                    x, y = dir
+                    found_dir = True
+                    break
+
+            if not found_dir:
+                x, y = possible_directions[0]
+
+        self.flush()
+
+
+class LegacyHuntAndKill(build.Sculptor):
+    '''
+    HuntAndKill before the bytearray hunt: nested row/column cursor, a fixed number of iterations and a frame rendered
+    even without gif.
+    '''
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False, x: int = 0, y: int = 0) -> None:
+        super().__init__(maze, seed, gif)
+
+        visited = np.zeros((maze.rows, maze.columns), dtype=bool)
+
+        unvisited_row = 0
+        unvisited_column = 0
+        self.add_frame(x, y)
+        for iter in range(maze.rows * maze.columns + 1):
+            visited[x][y] = 1
+
+            possible_directions = []
+            if maze.is_valid_position(x-1, y) and visited[x-1][y] == 0:
+                possible_directions.append(Maze.NORTH)
+            if maze.is_valid_position(x, y+1) and visited[x][y+1] == 0:
+                possible_directions.append(Maze.EAST)
+            if maze.is_valid_position(x+1, y) and visited[x+1][y] == 0:
+                possible_directions.append(Maze.SOUTH)
+            if maze.is_valid_position(x, y-1) and visited[x][y-1] == 0:
+                possible_directions.append(Maze.WEST)
+
+            if len(possible_directions) == 0:
+
+                found_unvisited = False
+                while unvisited_row < maze.rows:
+                    while unvisited_column < maze.columns:
+                        if visited[unvisited_row][unvisited_column] == 0:
+                            possible_directions = []
+                            if maze.is_valid_position(unvisited_row-1, unvisited_column) and visited[unvisited_row-1][unvisited_column] == 1:
+                                possible_directions.append(Maze.NORTH)
+                            if maze.is_valid_position(unvisited_row, unvisited_column+1) and visited[unvisited_row][unvisited_column+1] == 1:
+                                possible_directions.append(Maze.EAST)
+                            if maze.is_valid_position(unvisited_row+1, unvisited_column) and visited[unvisited_row+1][unvisited_column] == 1:
+                                possible_directions.append(Maze.SOUTH)
+                            if maze.is_valid_position(unvisited_row, unvisited_column-1) and visited[unvisited_row][unvisited_column-1] == 1:
+                                possible_directions.append(Maze.WEST)
+
+                            random.shuffle(possible_directions)
+
+                            x = unvisited_row
+                            y = unvisited_column
+
+                            self.carve(x, y, x + possible_directions[0].x, y + possible_directions[0].y)
+
+                            found_unvisited = True
+                            break
+
+                        unvisited_column += 1
+
+                    if unvisited_column == maze.columns:
+                        unvisited_row += 1
+                        unvisited_column = 0
+
+                    if found_unvisited:
+                        break
+
+            else:
+                random.shuffle(possible_directions)
+                self.carve(x, y, x + possible_directions[0].x, y + possible_directions[0].y)
+
+                if possible_directions[0] == Maze.NORTH:
+                    x = x - 1
+                elif possible_directions[0] == Maze.EAST:
+                    y = y + 1
+                elif possible_directions[0] == Maze.SOUTH:
+                    x = x + 1
+                else:
+                    y = y - 1
+
+        self.flush()
+
+
+class LegacyBinaryTree(build.Sculptor):
+    '''
+    BinaryTree before the array version: one random.random() call and one carve per cell.
+    '''
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        super().__init__(maze, seed, gif)
+
+        for i in range(maze.rows):
+            for j in range(maze.columns):
+                if random.random() < 0.5:
+                    if maze.is_valid_position(i-1, j):
+                        self.carve(i, j, i-1, j)
+                    elif maze.is_valid_position(i, j-1):
+                        self.carve(i, j, i, j-1)
+                else:
+                    if maze.is_valid_position(i, j-1):
+                        self.carve(i, j, i, j-1)
+                    elif maze.is_valid_position(i-1, j):
+                        self.carve(i, j, i-1, j)
+
+        self.flush()
+
+
+class LegacySidewinder(build.Sculptor):
+    '''
+    Sidewinder before the array version: one random.random() call per cell and runs kept as lists.
+    '''
+    def __init__(self, maze: Maze, seed: int = None, gif: bool = False) -> None:
+        super().__init__(maze, seed, gif)
+
+        for i in range(maze.columns):
+            if maze.is_valid_position(0, i+1):
+                self.carve(0, i, 0, i+1)
+
+        run = []
+        for i in range(1, maze.rows):
+            run.clear()
+            for j in range(maze.columns):
+                run.append((i, j))
+
+                if maze.is_valid_position(i, j+1) and random.random() > 0.5:
+                        self.carve(i, j, i, j+1)
+                else:
+                    cell = random.choice(run)
+                    self.carve(cell[0], cell[1], cell[0]-1, cell[1])
+                    run.clear()
+
+        self.flush()
+
+
+# Sculptor name: (original implementation, current implementation, largest size the original runs at by default)
+LEGACY = {
+    "RandomKruskal": (LegacyRandomKruskal, build.RandomKruskal, 128),
+    "RandomPrim": (LegacyRandomPrim, build.RandomPrim, 32),
+    "AldousBroder": (LegacyAldousBroder, build.AldousBroder, 128),
+    "HuntAndKill": (LegacyHuntAndKill, build.HuntAndKill, 512),
+    "BinaryTree": (LegacyBinaryTree, build.BinaryTree, 1024),
+    "Sidewinder": (LegacySidewinder, build.Sidewinder, 1024),
+    # Wilson is new: it is compared with the original AldousBroder, the other random walk Sculptor
+    "Wilson": (LegacyAldousBroder, build.Wilson, 128),
+}
+
+
+def is_perfect(maze: Maze) -> bool:
+    '''
+    A perfect maze has a single area and exactly one open wall less than cells.
+    '''
+    walls = maze.get_wall_mask()
+    active = maze.get_active_mask()
+    opened = ((walls[:, :-1] & Maze.EAST_BIT) == 0).sum() + ((walls[:-1, :] & Maze.SOUTH_BIT) == 0).sum()
+    return count_areas(walls, active) == 1 and opened == active.sum() - 1
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return (result, best)
+
+
+def carve(sculptor, size: int) -> Maze:
+    maze = ArrayMaze(size, size)
+    sculptor(maze, seed=0)
+    return maze
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sculptors", nargs="+", default=list(LEGACY), choices=list(LEGACY))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 128, 512])
+    parser.add_argument("--legacy-max", type=int, default=None, help="largest size the original implementations run at")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'sculptor':>15} {'size':>9} {'legacy (ms)':>12} {'new (ms)':>10} {'speedup':>8} {'cells/s':>11}")
+    for name in args.sculptors:
+        (legacy, current, legacy_max) = LEGACY[name]
+        legacy_max = legacy_max if args.legacy_max is None else args.legacy_max
+        for size in args.sizes:
+            (maze, seconds) = timed(lambda: carve(current, size), args.repeat)
+            assert is_perfect(maze), f"{name} did not carve a perfect {size}x{size} maze"
+
+            if size <= legacy_max:
+                (maze, legacy_seconds) = timed(lambda: carve(legacy, size), args.repeat)
+                assert is_perfect(maze), f"The original {name} did not carve a perfect {size}x{size} maze"
+                legacy_columns = f"{legacy_seconds * 1000:>12.2f} {seconds * 1000:>10.2f} {legacy_seconds / seconds:>7.1f}x"
+            else:
+                legacy_columns = f"{'-':>12} {seconds * 1000:>10.2f} {'-':>8}"
+            print(f"{name:>15} {f'{size}x{size}':>9} {legacy_columns} {size * size / seconds:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
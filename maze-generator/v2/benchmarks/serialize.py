@@ -0,0 +1,86 @@
+'''
+Benchmark for Maze.save() / Maze.load().
+
+Compares the binary maze files against the text dump written by Maze.array(file=...) (parsed back the only
+way it can be, as text) and checks that both round trips give back the same maze.
+
+Run from maze-generator/v2 with:
+    python -m benchmarks.serialize [--sizes 100 1000] [--batch 64] [--repeat 5]
+'''
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from amazed.modules.maze import Maze, ArrayMaze
+from amazed.modules.batch import MazeBatch
+
+
+def legacy_load(file: str, rows: int, columns: int) -> ArrayMaze:
+    '''
+    Reads back a file written by Maze.array(file=...).
+    '''
+    with open(file) as fin:
+        text = fin.read()
+    arr = np.array(text.replace("[", " ").replace("]", " ").split(), dtype=np.float64)
+    return Maze.build_from_array(arr, rows, columns)
+
+
+def random_maze(size: int, rng: np.random.Generator) -> ArrayMaze:
+    '''
+    The content does not matter for serialization, so random walls are used instead of a (slow) Sculptor.
+    '''
+    maze = ArrayMaze(size, size)
+    maze.set_wall_bits(rng.random(len(maze.get_wall_bits())) < 0.5)
+    return maze
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return (result, best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--batch", type=int, default=64, help="number of mazes of the batch round trip")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    directory = tempfile.mkdtemp()
+    text_file = os.path.join(directory, "maze.txt")
+    binary_file = os.path.join(directory, "maze.bin")
+
+    print(f"{'size':>11} {'text save (ms)':>15} {'text load (ms)':>15} {'binary save (ms)':>17} {'binary load (ms)':>17} {'load speedup':>13}")
+    for size in args.sizes:
+        maze = random_maze(size, rng)
+
+        (_, text_save) = timed(lambda: maze.array(file=text_file), args.repeat)
+        (text_maze, text_load) = timed(lambda: legacy_load(text_file, size, size), args.repeat)
+        (_, binary_save) = timed(lambda: maze.save(binary_file), args.repeat)
+        (binary_maze, binary_load) = timed(lambda: Maze.load(binary_file), args.repeat)
+
+        assert np.array_equal(text_maze.walls, maze.walls), f"Text round trip differs for size {size}"
+        assert np.array_equal(binary_maze.walls, maze.walls) and np.array_equal(binary_maze.active, maze.active), f"Binary round trip differs for size {size}"
+        print(f"{f'{size}x{size}':>11} {text_save * 1000:>15.2f} {text_load * 1000:>15.2f} {binary_save * 1000:>17.2f} {binary_load * 1000:>17.2f} {text_load / binary_load:>12.1f}x")
+
+    size = args.sizes[0]
+    batch = MazeBatch.from_mazes([random_maze(size, rng) for _ in range(args.batch)])
+    (_, batch_save) = timed(lambda: batch.save(binary_file), args.repeat)
+    (loaded, batch_load) = timed(lambda: MazeBatch.load(binary_file), args.repeat)
+    assert np.array_equal(loaded.walls, batch.walls), "Batch round trip differs"
+    print(f"\nBatch of {args.batch} mazes of {size}x{size}: save {batch_save * 1000:.2f} ms, load {batch_load * 1000:.2f} ms")
+
+    os.remove(text_file)
+    os.remove(binary_file)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+'''
+Benchmark for the shortest path solvers: Lee, AStar and BidirectionalBFS.
+
+Every Sculptor has its own bias (long corridors, many loops, straight runs...), which changes which solver wins,
+so each one carves a maze of its own. The solvers then go from the top left to the bottom right corner; the number of
+cells each one expanded is shown next to its time, and the three paths are checked to have the same length.
+
+Run from maze-generator/v2 with:
+    python -m benchmarks.solvers [--size 64] [--repeat 3]
+'''
+import argparse
+import time
+
+from amazed.modules.maze import ArrayMaze
+from amazed.modules import build
+from amazed.modules.solver import Lee, AStar, BidirectionalBFS
+
+# GeneticAlgorithm and NaturalLanguage need parameters of their own
+SCULPTORS = [
+    build.BinaryTree, build.HuntAndKill, build.DepthFirstSearch, build.RandomKruskal, build.AldousBroder, build.RandomCarving,
+    build.Spiral, build.Sidewinder, build.RandomPrim, build.RecursiveDivision, build.WallsCellularAutomata,
+]
+
+
+def expanded(solver) -> int:
+    '''
+    Lee expands every cell it can reach, the other solvers count it themselves.
+    '''
+    if isinstance(solver, Lee):
+        return int((solver.array != -1).sum())
+    return solver.expanded
+
+
+def timed(solver_class, maze, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        solver = solver_class(maze)
+        start = time.perf_counter()
+        solver.solve()
+        best = min(best, time.perf_counter() - start)
+    return (solver, best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    solvers = [Lee, AStar, BidirectionalBFS]
+    print(f"{'sculptor':>22} {'path':>6} " + " ".join(f"{solver.__name__ + ' ms (cells)':>28}" for solver in solvers) + f" {'winner':>17}")
+    for sculptor in SCULPTORS:
+        maze = ArrayMaze(args.size, args.size)
+        sculptor(maze, seed=0)
+        maze.neighbors()
+
+        results = []
+        try:
+            for solver_class in solvers:
+                results.append(timed(solver_class, maze, args.repeat))
+        except (ValueError, RuntimeError):
+            print(f"{sculptor.__name__:>22} {'no path between the corners':>33}")
+            continue
+
+        lengths = {len(solver.steps) for (solver, _) in results}
+        assert len(lengths) == 1, f"The solvers found paths of different lengths on {sculptor.__name__}: {lengths}"
+        winner = min(range(len(solvers)), key=lambda i: results[i][1])
+        cells = " ".join(f"{f'{seconds * 1000:.2f} ({expanded(solver)})':>28}" for (solver, seconds) in results)
+        print(f"{sculptor.__name__:>22} {lengths.pop():>6} {cells} {solvers[winner].__name__:>17}")
+
+
+if __name__ == "__main__":
+    main()
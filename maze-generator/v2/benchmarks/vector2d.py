@@ -0,0 +1,126 @@
+'''
+Microbenchmark for Vector2D.
+
+Times the two hottest uses of Vector2D, with the current class and with the original one (kept below as reference):
+    - wall lookups: cell.walls[direction] on Maze.Cell dicts keyed by directions
+    - player moves: direction = next_cell - pos, checked against the four directions, then pos + direction
+
+Run from maze-generator/v2 with:
+    python -m benchmarks.vector2d [--size 64] [--repeat 5]
+'''
+import argparse
+import random
+import time
+
+from amazed.modules.maze import Maze, Vector2D
+
+
+class LegacyVector2D():
+    '''
+    The implementation Vector2D had before __slots__, integer hashing and interning.
+    '''
+    def __init__(self, x_or_pair, y=None):
+        if y is None:
+            if isinstance(x_or_pair, tuple) and len(x_or_pair) == 2:
+                self.x, self.y = x_or_pair
+            else:
+                raise ValueError("Expected a tuple with 2 values.")
+        else:
+            self.x = x_or_pair
+            self.y = y
+
+    def __add__(self, other):
+        return LegacyVector2D(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        if isinstance(other, tuple):
+            return LegacyVector2D(self.x - other[0], self.y - other[1])
+        return LegacyVector2D(self.x - other.x, self.y - other.y)
+
+    def __eq__(self, other):
+        if isinstance(other, LegacyVector2D):
+            return self.x == other.x and self.y == other.y
+        return False
+
+    def __hash__(self):
+        return hash(hash(str(self.x)) + hash(str(self.y)))
+
+
+def wall_lookups(directions: tuple, cells: list, queries: list) -> int:
+    '''
+    @queries: (cell index, direction index) pairs, looked up the way Maze.is_wall() does.
+    '''
+    open_walls = 0
+    for (index, d) in queries:
+        if not cells[index][directions[d]]:
+            open_walls += 1
+    return open_walls
+
+
+def player_moves(vector, directions: tuple, path: list) -> int:
+    '''
+    Same steps as Player._move(): convert the next cell, derive and check the direction, then move.
+    '''
+    pos = vector(path[0])
+    moves = 0
+    for cell in path[1:]:
+        next_cell = vector(cell)
+        direction = next_cell - pos
+        if direction not in directions:
+            raise ValueError(f"Cannot move from ({pos.x}, {pos.y}) to {cell}")
+        pos = pos + direction
+        moves += 1
+    return moves
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return (result, best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=64, help="side of the maze whose cells are queried")
+    parser.add_argument("--lookups", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    offsets = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    queries = [(random.randrange(args.size * args.size), random.randrange(4)) for _ in range(args.lookups)]
+
+    # A random walk, as played by Player._move()
+    path = [(args.size // 2, args.size // 2)]
+    for _ in range(args.lookups):
+        (dx, dy) = random.choice(offsets)
+        path.append((path[-1][0] + dx, path[-1][1] + dy))
+
+    print(f"{'benchmark':>14} {'legacy (ms)':>12} {'Vector2D (ms)':>14} {'speedup':>9}")
+    for (name, func) in [("wall lookups", wall_lookups), ("player moves", player_moves)]:
+        results = []
+        for vector in (LegacyVector2D, Vector2D):
+            # The direction constants, as Maze defines them
+            if vector is Vector2D:
+                directions = (Maze.NORTH, Maze.EAST, Maze.SOUTH, Maze.WEST)
+            else:
+                directions = tuple(vector(dx, dy) for (dx, dy) in offsets)
+
+            if func is wall_lookups:
+                cells = [{direction: random.random() < 0.5 for direction in directions} for _ in range(args.size * args.size)]
+                results.append(timed(lambda: func(directions, cells, queries), args.repeat))
+            else:
+                results.append(timed(lambda: func(vector, directions, path), args.repeat))
+
+        ((_, legacy_time), (_, new_time)) = results
+        print(f"{name:>14} {legacy_time * 1000:>12.2f} {new_time * 1000:>14.2f} {legacy_time / new_time:>8.1f}x")
+
+    # Sanity check: moves computed by subtraction are the interned directions of the maze
+    assert Vector2D(3, 4) - Vector2D(4, 4) is Maze.NORTH and Maze.Cell().walls[Vector2D(0, 1)]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from amazed.modules.maze import Maze
 from amazed.modules.build import DepthFirstSearch
 from amazed.modules.build import Sculptor
-from amazed.modules.solver import AStar
+from amazed.modules.solver import DistanceCache
 from strategies import SimpleAgent
 from strategies import Player
 
@@ -186,6 +186,16 @@ class GameMaster():
         self.playerA.maze = self.maze
         self.playerB.maze = self.maze
 
+        # On small boards, every shortest path length needed to score the players becomes a lookup
+        if self.maze.rows * self.maze.columns <= DistanceCache.ALL_PAIRS_LIMIT:
+            self.maze.distances().all_pairs()
+
+    def _path_length(self, player: Player) -> int:
+        '''
+        Number of cells on the shortest path from the position of @player to its finish (both included).
+        '''
+        return self.maze.distances().distance(player.pos.to_tuple(), player.finish) + 1
+
 
     def _create_start_finish(self):
         
@@ -385,10 +395,8 @@ class GameMaster():
             # # GA related settings
             # self.playerA.individual_score += 2
             self.playerA.individual_score += 1
-            astar = AStar(self.maze, start=self.playerB.pos.to_tuple(), end=self.playerB.finish)
-            astar.solve()
             # self.playerB.individual_score -= 1
-            self.playerB.individual_score += 1 / len(astar.steps)
+            self.playerB.individual_score += 1 / self._path_length(self.playerB)
             # # #
 
             self.logger.info("A won the game.", extra={"who": "GameMaster"})
@@ -402,10 +410,8 @@ class GameMaster():
             # self.playerB.individual_score += 2
             # self.playerA.individual_score -= 1
             self.playerB.individual_score += 1
-            astar = AStar(self.maze, start=self.playerA.pos.to_tuple(), end=self.playerA.finish)
-            astar.solve()
             # self.playerB.individual_score -= 1
-            self.playerA.individual_score += 1 / len(astar.steps)
+            self.playerA.individual_score += 1 / self._path_length(self.playerA)
             # # #
             self.logger.info("B won the game.", extra={"who": "GameMaster"})
 
@@ -422,15 +428,11 @@ class GameMaster():
             self.set_state(self.DRAW)
             # self.playerA.individual_score -= 2
             # self.playerB.individual_score -= 2
-            astar = AStar(self.maze, start=self.playerA.pos.to_tuple(), end=self.playerA.finish)
-            astar.solve()
             # self.playerB.individual_score -= 1
-            self.playerA.individual_score += 1 / len(astar.steps)
+            self.playerA.individual_score += 1 / self._path_length(self.playerA)
 
-            astar = AStar(self.maze, start=self.playerB.pos.to_tuple(), end=self.playerB.finish)
-            astar.solve()
             # self.playerB.individual_score -= 1
-            self.playerB.individual_score += 1 / len(astar.steps)
+            self.playerB.individual_score += 1 / self._path_length(self.playerB)
             
         else:
             self.iteration += 1
@@ -1,7 +1,8 @@
 import pygame
 import random
+import numpy as np
 from amazed.modules.maze import Maze, Vector2D
-from amazed.modules.solver import AStar
+from amazed.modules.solver import AStar, DStarLite
 import logging
 
 class Player():
@@ -36,6 +37,9 @@ class Player():
         # All cells are tuples (x, y), not Vector2D!
         self.dfs_stack = []
         # self._internal_dfs()
+
+        # Incremental path planners, kept between turns (see _planner())
+        self._planners = {}
         
         # Recalculate the DFS path every X turns
         self.turn_counter = 0
@@ -233,86 +237,58 @@ class Player():
         # Taxi cab
         return abs(x-endx) + abs(y-endy)
 
-    def _internal_dfs(self, ignore_unknowns:bool):
+    def _known_cells(self) -> np.ndarray:
         '''
-        Perform a new DFS each time a cell adjacent to a previous visited cell or a future cell is discovered.\n
+        (rows, columns) boolean array of the cells visible to this player.
         '''
+        attribute = "visibleA" if self.name == "PlayerA" else "visibleB"
+        return np.array([[getattr(cell, attribute) for cell in row] for row in self.maze.data], dtype=bool)
 
-        self.full_discovered = False
+    def _planner(self, ignore_unknowns:bool, unknown_penalty:float) -> DStarLite:
+        '''
+        The incremental planner used for @ignore_unknowns (one is kept for each value), brought up to date with the
+        current position and the visible cells. A new one is only created for a new maze, finish or penalty, or if cells
+        stopped being visible (a new round).
+        '''
+        known = self._known_cells()
+        unknown_cost = None if ignore_unknowns else unknown_penalty
+        planner = self._planners.get(ignore_unknowns)
+        if planner is None or planner.maze is not self.maze or planner.revision != self.maze.revision \
+                or planner.end != self.finish or planner.unknown_cost != unknown_cost or (planner.known & ~known).any():
+            planner = DStarLite(self.maze, (self.pos.x, self.pos.y), self.finish, known, unknown_cost)
+            self._planners[ignore_unknowns] = planner
+        else:
+            if planner.start != (self.pos.x, self.pos.y):
+                planner.move((self.pos.x, self.pos.y))
+            planner.reveal(map(tuple, np.argwhere(known & ~planner.known).tolist()))
+        return planner
 
-        # How much penalty should taking an unknown cell step add to the total distance
-        unknown_penalty = 1.2
+    def _internal_dfs(self, ignore_unknowns:bool, unknown_penalty:float = 1.2, choose = None):
+        '''
+        Recalculate the path to the finish each time a cell adjacent to a previous visited cell or a future cell is discovered.\n
+        The path is kept in self.dfs_stack (next cell first, finish last). It is the cheapest one given what this player knows,
+        taking a step into an unknown cell costing @unknown_penalty (unknown cells are avoided if @ignore_unknowns).
+        The search is incremental (D* Lite, see amazed.modules.solver.DStarLite): its state is kept between calls,
+        and only the part affected by the moves and the newly visible cells is searched again.\n
+        @choose: see DStarLite.solve().
+        '''
+
+        self.full_discovered = False
 
         # print(f"[ Debug ][ {self.name} ] Recalculating DFS. From current position {self.pos} to finish at {self.finish}")
         self.logger.debug(f"Recalculating DFS. From current position {self.pos} to finish at {self.finish}", extra={"who": self.name})
 
         self.dfs_stack.clear()
-        self.dfs_stack.append((self.pos.x, self.pos.y))
-        visited = []
-
-        while len(self.dfs_stack) > 0 and self.dfs_stack[-1] != self.finish:
-            pqueue = []
-            (x, y) = self.dfs_stack[-1]
-            visited.append((x, y))
-
-            # North
-            if self.maze.is_valid_position(x-1, y):
-                if not (x-1, y) in visited:
-                    if self.is_visible(x-1, y):
-                        if not self.maze.is_wall(x, y, x-1, y):
-                            distance = self._distance_metric((x-1, y), self.finish)
-                            pqueue.append((x-1, y, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x-1, y), self.finish) * unknown_penalty
-                        pqueue.append((x-1, y, distance))
-            
-            # East
-            if self.maze.is_valid_position(x, y+1):
-                if not (x, y+1) in visited:
-                    if self.is_visible(x, y+1):
-                        if not self.maze.is_wall(x, y, x, y+1):
-                            distance = self._distance_metric((x, y+1), self.finish)
-                            pqueue.append((x, y+1, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x, y+1), self.finish) * unknown_penalty
-                        pqueue.append((x, y+1, distance))
-            
-            # South
-            if self.maze.is_valid_position(x+1, y):
-                if not (x+1, y) in visited:
-                    if self.is_visible(x+1, y):
-                        if not self.maze.is_wall(x, y, x+1, y):
-                            distance = self._distance_metric((x+1, y), self.finish)
-                            pqueue.append((x+1, y, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x+1, y), self.finish) * unknown_penalty
-                        pqueue.append((x+1, y, distance))
-            
-            # West
-            if self.maze.is_valid_position(x, y-1):
-                if not (x, y-1) in visited:
-                    if self.is_visible(x, y-1):
-                        if not self.maze.is_wall(x, y, x, y-1):
-                            distance = self._distance_metric((x, y-1), self.finish)
-                            pqueue.append((x, y-1, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x, y-1), self.finish) * unknown_penalty
-                        pqueue.append((x, y-1, distance))
-
-            if len(pqueue) != 0:
-                # Sort the queue based on distance
-                pqueue.sort(key=lambda tup:tup[2])
-                self.dfs_stack.append((pqueue[0][0], pqueue[0][1]))
-            else:
-                self.dfs_stack.pop()
-
-        if len(self.dfs_stack) == 0:
+        planner = self._planner(ignore_unknowns, unknown_penalty)
+        try:
+            planner.solve(choose)
+        except ValueError:
             if ignore_unknowns:
                 return
             
             self.logger.error(f"Could not find a connected path from {self.start} to {self.finish}!", extra={"who": self.name})
             raise ValueError(f"[{self.name}] Could not find a connected path from {self.start} to {self.finish}!")
 
-        self.dfs_stack.pop(0)
+        self.dfs_stack.extend(planner.steps[1:])
         # print(f"[ Debug ][ {self.name} ] Recalculated DFS: {self.dfs_stack}")
-        self.logger.info(f"Recalculated DFS, starting from {self.pos}: {self.dfs_stack}", extra={"who": self.name})
\ No newline at end of file
+        self.logger.info(f"Recalculated DFS, starting from {self.pos}: {self.dfs_stack}", extra={"who": self.name})
@@ -172,7 +172,7 @@ for game in range(GAMES):
             reward = -0.3
         elif maze.is_valid_position(x_new, y_new):
             
-            if maze.is_wall(x, y, x_new, y_new):
+            if (x_new, y_new) not in maze.open_neighbors(x, y):
                 game_over = 'illegal-move'
                 reward = -1
             else:
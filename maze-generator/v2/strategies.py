@@ -351,109 +351,23 @@ class SimpleAgent(Player):
     
     def _internal_dfs(self, ignore_unknowns:bool):
         '''
-        Perform a new DFS each time a cell adjacent to a previous visited cell or a future cell is discovered.\n
+        Recalculate the path to the finish (see Player._internal_dfs()), a step into an unknown cell costing UNKNOWN_CELL_MODIFIER.\n
         Use the DFS_EXPLORATION_RATE to sometimes include worse options in the event that they will lead to better outcomes, similar to Simulated Annealing.
         '''
+        super()._internal_dfs(ignore_unknowns, self.unknown_cell_modifier, self._explore)
 
-        self.full_discovered = False
-
-        # How much penalty should taking an unknown cell step add to the total distance
-        # unknown_penalty = 1.2
-        unknown_penalty = self.unknown_cell_modifier
-
-        # print(f"[ Debug ][ {self.name} ] Recalculating DFS. From current position {self.pos} to finish at {self.finish}")
-        self.logger.debug(f"Recalculating DFS. From current position {self.pos} to finish at {self.finish}", extra={"who": self.name})
-
-        self.dfs_stack.clear()
-        self.dfs_stack.append((self.pos.x, self.pos.y))
-        visited = []
-
-        while len(self.dfs_stack) > 0 and self.dfs_stack[-1] != self.finish:
-
-            pqueue = []
-            (x, y) = self.dfs_stack[-1]
-            visited.append((x, y))
-
-            # North
-            if self.maze.is_valid_position(x-1, y):
-                if not (x-1, y) in visited:
-                    if self.is_visible(x-1, y):
-                        if not self.maze.is_wall(x, y, x-1, y):
-                            distance = self._distance_metric((x-1, y), self.finish)
-                            pqueue.append((x-1, y, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x-1, y), self.finish) * unknown_penalty
-                        pqueue.append((x-1, y, distance))
-            
-            # East
-            if self.maze.is_valid_position(x, y+1):
-                if not (x, y+1) in visited:
-                    if self.is_visible(x, y+1):
-                        if not self.maze.is_wall(x, y, x, y+1):
-                            distance = self._distance_metric((x, y+1), self.finish)
-                            pqueue.append((x, y+1, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x, y+1), self.finish) * unknown_penalty
-                        pqueue.append((x, y+1, distance))
-            
-            # South
-            if self.maze.is_valid_position(x+1, y):
-                if not (x+1, y) in visited:
-                    if self.is_visible(x+1, y):
-                        if not self.maze.is_wall(x, y, x+1, y):
-                            distance = self._distance_metric((x+1, y), self.finish)
-                            pqueue.append((x+1, y, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x+1, y), self.finish) * unknown_penalty
-                        pqueue.append((x+1, y, distance))
-            
-            # West
-            if self.maze.is_valid_position(x, y-1):
-                if not (x, y-1) in visited:
-                    if self.is_visible(x, y-1):
-                        if not self.maze.is_wall(x, y, x, y-1):
-                            distance = self._distance_metric((x, y-1), self.finish)
-                            pqueue.append((x, y-1, distance))
-                    elif not ignore_unknowns:
-                        distance = self._distance_metric((x, y-1), self.finish) * unknown_penalty
-                        pqueue.append((x, y-1, distance))
-
-            if len(pqueue) != 0:
-                # Sort the queue based on distance
-                pqueue.sort(key=lambda tup:tup[2])
-
-                index = 0
-                
-                # while random.random() <= self.dfs_exploration_chance:
-                    
-                #     # This is to avoid selecting a cell that does not exist in the priority queue
-                #     if index == len(pqueue) - 1:
-                #         break
-
-                #     index += 1
-                #     self.dfs_exploration_chance *= 0.95
-
-                if len(pqueue) > 1 and random.random() <= self.dfs_exploration_chance:
-                    index = random.randint(1, len(pqueue)-1)
-                    self.logger.debug(f"I prefered to go with {pqueue[index]} with index={index} instead of {pqueue[0]} because I am exploring! My exploration chance is {self.dfs_exploration_chance}.", extra={"who": self.name})
-                    self.dfs_exploration_chance *= 0.95
-                else:
-                    self.logger.debug(f"Right now I went with the best choice, that being {pqueue[0]}!", extra={"who": self.name})
-
-                self.dfs_stack.append((pqueue[index][0], pqueue[index][1]))
-            else:
-                self.dfs_stack.pop()
+    def _explore(self, candidates: list) -> int:
+        '''
+        Index of the next cell to take out of @candidates, sorted from the best one (see DStarLite.solve()).
+        '''
+        if len(candidates) > 1 and random.random() <= self.dfs_exploration_chance:
+            index = random.randint(1, len(candidates)-1)
+            self.logger.debug(f"I prefered to go with {candidates[index]} with index={index} instead of {candidates[0]} because I am exploring! My exploration chance is {self.dfs_exploration_chance}.", extra={"who": self.name})
+            self.dfs_exploration_chance *= 0.95
+            return index
         
-        if len(self.dfs_stack) == 0:
-            if ignore_unknowns:
-                return
-            
-            self.logger.error(f"Could not find a connected path from {self.start} to {self.finish}!", extra={"who": self.name})
-            raise ValueError(f"[{self.name}] Could not find a connected path from {self.start} to {self.finish}!")
-
-        self.dfs_stack.pop(0)
-        # print(f"[ Debug ][ {self.name} ] Recalculated DFS: {self.dfs_stack}")
-        self.logger.info(f"Recalculated DFS, starting from {self.pos}: {self.dfs_stack}", extra={"who": self.name})
+        self.logger.debug(f"Right now I went with the best choice, that being {candidates[0]}!", extra={"who": self.name})
+        return 0
 
 class Human(Player):
 
@@ -8,6 +8,7 @@ from matplotlib import pyplot
 
 from logger import console
 from amazed.modules.maze import Maze
+from amazed.modules.batch import MazeBatch
 import gans as GAN
 
 # Global variables
@@ -98,12 +99,12 @@ def create_dataset(func, name='hk', size=1000):
     '''
     Function for dataset creation.
     '''
-    d = np.zeros((size, 4096,))
-    for i in range(size):
-        m = Maze(64, 64)
+    batch = MazeBatch(size, 64, 64)
+    for i, m in enumerate(batch):
+        # Each maze is carved directly inside the batch
         func(m)
-        d[i:] = m.array()
         print(f'Added maze with ID {i}')
+    d = batch.array()
     np.savez_compressed(f'dataset_{size}_{name}.npz', data=d)
 
 